@@ -1,8 +1,48 @@
+import array
+import collections
+import concurrent.futures
+import csv
+import getpass
+import hashlib
+import itertools
+import json
+import logging
+import math
+import mmap
 import os
+import select
+import socket
+import struct
+import threading
 import time
 
-from PyQt5 import QtCore, QtGui, QtWidgets
-from pynput import keyboard
+from PyQt5 import QtCore, QtGui, QtNetwork, QtWidgets
+
+log = logging.getLogger("mousefollow")
+
+
+class StartupTimer:
+    """Wall time spent in each startup phase, logged once interactive."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        log.info(
+            "interactive after %.1f ms (%s)",
+            (self.last - self.started) * 1000,
+            ", ".join("%s %.1f ms" % (name, t * 1000) for name, t in self.phases),
+        )
+
+
+startup = StartupTimer()
 
 
 def is_int(char):
@@ -13,40 +53,1817 @@ def is_int(char):
         return False
 
 
-class Mover(QtCore.QThread):
-    signal = QtCore.pyqtSignal("PyQt_PyObject")
+class RingBuffer:
+    """Fixed-size float ring, the oldest samples are overwritten."""
+
+    def __init__(self, size=4096):
+        self.size = size
+        self.data = array.array("d", bytes(8 * size))
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.count % self.size] = value
+        self.count += 1
+
+    def values(self):
+        return self.data[: min(self.count, self.size)].tolist()
+
+
+class Profiler:
+    """Opt-in timing recorder for the hot paths.
+
+    Call sites guard on `enabled`, so a disabled profiler costs one attribute
+    check per frame. All durations are recorded in seconds.
+    """
+
+    METRICS = (
+        "frame_interval",
+        "move_dot",
+        "sample_to_move",
+        "hotkey",
+        "pixmap_rebuild",
+    )
+    PERCENTILES = (50, 75, 90, 95, 99, 99.9)
+
+    def __init__(self, size=4096):
+        self.enabled = False
+        self.buffers = {name: RingBuffer(size) for name in self.METRICS}
+        self.last_frame = None
+
+    def record(self, name, seconds):
+        self.buffers[name].append(seconds)
+
+    def frame(self, started, sampled):
+        now = time.perf_counter()
+        self.buffers["move_dot"].append(now - started)
+        self.buffers["sample_to_move"].append(now - sampled)
+        if self.last_frame is not None:
+            self.buffers["frame_interval"].append(started - self.last_frame)
+        self.last_frame = started
+
+    def percentiles(self, name):
+        values = sorted(self.buffers[name].values())
+        if not values:
+            return {}
+        result = {}
+        for p in self.PERCENTILES:
+            index = min(len(values) - 1, int(len(values) * p / 100))
+            result["p" + str(p)] = values[index] * 1000
+        result["max"] = values[-1] * 1000
+        return result
+
+    def summary(self):
+        return {
+            name: dict(count=self.buffers[name].count, **self.percentiles(name))
+            for name in self.METRICS
+        }
+
+    def dump(self, path):
+        summary = self.summary()
+        if path.endswith(".csv"):
+            columns = ["count"] + ["p" + str(p) for p in self.PERCENTILES] + ["max"]
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(
+                    ["metric"] + [c if c == "count" else c + "_ms" for c in columns]
+                )
+                for name, row in summary.items():
+                    writer.writerow([name] + [row.get(c, "") for c in columns])
+        else:
+            with open(path, "w") as f:
+                json.dump(summary, f, indent=2)
+        log.info("timings written to %s", path)
+
+
+profiler = Profiler()
+
+
+class CursorSource:
+    """Produces cursor positions and pushes them into a sink.
+
+    The sink is FrameScheduler.post, which may be called from any thread and
+    only keeps the newest position, so sources can push at any rate.
+    """
+
+    def __init__(self):
+        self.sink = None
+
+    def set_refresh_rate(self, rate):
+        pass
+
+    def start(self, sink):
+        self.sink = sink
+
+    def stop(self):
+        self.sink = None
+
+
+class QtPollSource(CursorSource):
+    """Polls QCursor.pos() once per display frame on the GUI thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.last_pos = None
+        self.timer = QtCore.QTimer()
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.poll)
+
+    def set_refresh_rate(self, rate):
+        self.timer.setInterval(max(1, int(1000 / rate)))
+
+    def start(self, sink):
+        super().start(sink)
+        self.last_pos = None
+        self.poll()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        super().stop()
+
+    def poll(self):
+        pos = QtGui.QCursor.pos()
+        if pos != self.last_pos:
+            self.last_pos = pos
+            self.sink(pos.x(), pos.y())
+
+
+class PynputSource(CursorSource):
+    """Pushes positions from a pynput mouse listener thread."""
+
+    def __init__(self):
+        super().__init__()
+        from pynput import mouse
+
+        self.mouse = mouse
+        self.listener = None
+
+    def start(self, sink):
+        super().start(sink)
+        self.listener = self.mouse.Listener(on_move=sink)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        super().stop()
+
+
+class EvdevSource(CursorSource):
+    """Reads pointer devices with evdev on a dedicated select() thread.
+
+    Relative motion is accumulated onto the cursor position at start and
+    clamped to the virtual desktop; absolute devices (tablets, touch screens)
+    are scaled onto it. Touchpads are skipped, their absolute coordinates are
+    on the pad rather than the screen. Devices are only held open while the
+    source runs. Needs read access to /dev/input.
+    """
+
+    def __init__(self):
+        super().__init__()
+        import evdev
+
+        self.evdev = evdev
+        self.paths = [path for path in evdev.list_devices() if self.is_pointer(path)]
+        if not self.paths:
+            raise OSError("no readable pointer devices in /dev/input")
+        self.devices = []
+        self.thread = None
+        self.wakeup = None
+
+    def is_pointer(self, path):
+        ecodes = self.evdev.ecodes
+        try:
+            device = self.evdev.InputDevice(path)
+        except OSError:
+            return False  # not readable by this user
+        try:
+            caps = device.capabilities()
+        finally:
+            device.close()
+        if ecodes.REL_X in caps.get(ecodes.EV_REL, []):
+            return True
+        abs_codes = [code for code, info in caps.get(ecodes.EV_ABS, [])]
+        keys = caps.get(ecodes.EV_KEY, [])
+        return ecodes.ABS_X in abs_codes and ecodes.BTN_TOOL_FINGER not in keys
+
+    def start(self, sink):
+        super().start(sink)
+        self.devices = []
+        for path in self.paths:
+            try:
+                self.devices.append(self.evdev.InputDevice(path))
+            except OSError as e:
+                log.warning("cannot open %s: %s", path, e)
+        pos = QtGui.QCursor.pos()
+        self.x, self.y = pos.x(), pos.y()
+        self.bounds = QtWidgets.qApp.primaryScreen().virtualGeometry()
+        self.wakeup = os.pipe()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            os.write(self.wakeup[1], b"x")
+            self.thread.join()
+            for fd in self.wakeup:
+                os.close(fd)
+            self.thread = None
+        for device in self.devices:
+            device.close()
+        self.devices = []
+        super().stop()
+
+    def scale_abs(self, device, code, value, origin, length):
+        info = device.absinfo(code)
+        span = max(1, info.max - info.min)
+        return origin + (value - info.min) * (length - 1) // span
+
+    def run(self):
+        ecodes = self.evdev.ecodes
+        bounds = self.bounds
+        fds = {device.fd: device for device in self.devices}
+        stop_fd = self.wakeup[0]
+        while True:
+            ready, _, _ = select.select(list(fds) + [stop_fd], [], [])
+            if stop_fd in ready:
+                return
+            x, y = self.x, self.y
+            for fd in ready:
+                device = fds[fd]
+                try:
+                    events = device.read()
+                    for event in events:
+                        if event.type == ecodes.EV_REL:
+                            if event.code == ecodes.REL_X:
+                                x += event.value
+                            elif event.code == ecodes.REL_Y:
+                                y += event.value
+                        elif event.type == ecodes.EV_ABS:
+                            if event.code == ecodes.ABS_X:
+                                x = self.scale_abs(
+                                    device,
+                                    event.code,
+                                    event.value,
+                                    bounds.left(),
+                                    bounds.width(),
+                                )
+                            elif event.code == ecodes.ABS_Y:
+                                y = self.scale_abs(
+                                    device,
+                                    event.code,
+                                    event.value,
+                                    bounds.top(),
+                                    bounds.height(),
+                                )
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    # an unplugged device stays readable but every read fails
+                    del fds[fd]
+                    continue
+            x = min(max(x, bounds.left()), bounds.right())
+            y = min(max(y, bounds.top()), bounds.bottom())
+            if (x, y) != (self.x, self.y):
+                self.x, self.y = x, y
+                # one push per batch of reads, the scheduler coalesces further
+                self.sink(x, y)
+
+
+class ReplaySource(CursorSource):
+    """Replays a recorded (t, x, y) trace with its original timing."""
+
+    def __init__(self, trace, speed=1.0, loop=False):
+        super().__init__()
+        self.trace = trace
+        self.speed = speed
+        self.loop = loop
+        self.thread = None
+        self.stopped = threading.Event()
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        trace = []
+        with open(path, "r") as f:
+            for line in f:
+                fields = line.strip().split(",")
+                if len(fields) != 3 or not is_int(fields[1]):
+                    continue  # header or blank line
+                trace.append((float(fields[0]), int(fields[1]), int(fields[2])))
+        return cls(trace, **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        if path.endswith(SESSION_SUFFIX):
+            return cls(SessionReader(path), **kwargs)
+        return cls.from_csv(path, **kwargs)
+
+    def start(self, sink):
+        super().start(sink)
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stopped.set()
+            self.thread.join()
+            self.thread = None
+        super().stop()
+
+    def run(self):
+        sink = self.sink
+        while True:
+            t0 = None
+            start = time.perf_counter()
+            for t, x, y in self.trace:
+                if t0 is None:
+                    t0 = t
+                delay = start + (t - t0) / self.speed - time.perf_counter()
+                if delay > 0 and self.stopped.wait(delay):
+                    return
+                if self.stopped.is_set():
+                    return
+                sink(x, y)
+            if not self.loop:
+                return
+
+
+SESSION_SUFFIX = ".mfrec"
+SESSION_MAGIC = b"MFREC"
+SESSION_VERSION = 2  # 2 adds the laser centre on the target to each record
+SESSION_HEADER = "<5sBHd"  # magic, version, records per chunk, start epoch
+CHUNK_HEADER = "<diiiiHxx"  # t0, x0, y0, laser x0, laser y0, record count
+
+FLAG_LASER = 1
+FLAG_ANNOTATE = 2
+FLAG_INK = 4
+
+
+def chunk_dtype(capacity, version=SESSION_VERSION):
+    """numpy layout of one fixed-size chunk: a keyframe, then the columns."""
+    import numpy as np
+
+    if version == 1:
+        return np.dtype(
+            [
+                ("t0", "<f8"),
+                ("x0", "<i4"),
+                ("y0", "<i4"),
+                ("count", "<u2"),
+                ("pad", "<u2"),
+                ("dt", "<f4", (capacity,)),
+                ("dx", "<i2", (capacity,)),
+                ("dy", "<i2", (capacity,)),
+                ("flags", "u1", (capacity,)),
+            ]
+        )
+    return np.dtype(
+        [
+            ("t0", "<f8"),
+            ("x0", "<i4"),
+            ("y0", "<i4"),
+            ("lx0", "<i4"),
+            ("ly0", "<i4"),
+            ("count", "<u2"),
+            ("pad", "<u2"),
+            ("dt", "<f4", (capacity,)),
+            ("dx", "<i2", (capacity,)),
+            ("dy", "<i2", (capacity,)),
+            ("dlx", "<i2", (capacity,)),
+            ("dly", "<i2", (capacity,)),
+            ("flags", "u1", (capacity,)),
+        ]
+    )
+
+
+class SessionRecorder:
+    """Appends (t, x, y, flags) records to a columnar .mfrec file.
+
+    Each record also keeps where the laser was drawn, in desktop coordinates,
+    so the track can be exported after the regions have moved.
+
+    Records are delta-encoded into fixed-size chunks, each starting from an
+    absolute keyframe, so any chunk decodes on its own. Full chunks are handed
+    to a worker thread; the caller only pays for a few array appends.
+    """
+
+    def __init__(self, path, capacity=1024):
+        self.path = path
+        self.capacity = capacity
+        self.file = open(path, "wb")
+        self.file.write(
+            struct.pack(
+                SESSION_HEADER, SESSION_MAGIC, SESSION_VERSION, capacity, time.time()
+            )
+        )
+        self.file.flush()  # a recording cut short by a crash still opens
+        self.writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.records = 0
+        self.last = None
+        self.new_chunk()
+
+    def new_chunk(self):
+        self.key = None
+        self.dt = array.array("f")
+        self.dx = array.array("h")
+        self.dy = array.array("h")
+        self.dlx = array.array("h")
+        self.dly = array.array("h")
+        self.flags = array.array("B")
+
+    def append(self, t, x, y, flags, laser=None):
+        """Add a cursor position; `laser` defaults to the previous one."""
+        x = int(x)
+        y = int(y)
+        if laser is not None:
+            lx = round(laser[0])
+            ly = round(laser[1])
+        elif self.last is not None:
+            lx, ly = self.last[3], self.last[4]
+        else:
+            lx, ly = x, y
+        if self.key is not None:
+            last_t, last_x, last_y, last_lx, last_ly = self.last
+            dx = x - last_x
+            dy = y - last_y
+            dlx = lx - last_lx
+            dly = ly - last_ly
+            if len(self.dt) == self.capacity or not (
+                -32768 <= dx <= 32767
+                and -32768 <= dy <= 32767
+                and -32768 <= dlx <= 32767
+                and -32768 <= dly <= 32767
+            ):
+                self.flush_chunk()
+        if self.key is None:
+            self.key = (t, x, y, lx, ly)
+            dt = dx = dy = dlx = dly = 0
+        else:
+            dt = t - last_t
+        self.dt.append(dt)
+        self.dx.append(dx)
+        self.dy.append(dy)
+        self.dlx.append(dlx)
+        self.dly.append(dly)
+        self.flags.append(flags)
+        self.last = (t, x, y, lx, ly)
+        self.records += 1
+
+    def mark(self, t, flags):
+        """Record a state change at the last known position."""
+        if self.last is not None:
+            self.append(t, self.last[1], self.last[2], flags)
+
+    def flush_chunk(self):
+        if self.key is None:
+            return
+        self.writer.submit(
+            self.write_chunk,
+            self.key,
+            (self.dt, self.dx, self.dy, self.dlx, self.dly, self.flags),
+        )
+        self.new_chunk()
+
+    def write_chunk(self, key, columns):
+        count = len(columns[0])
+        padding = self.capacity - count
+        self.file.write(struct.pack(CHUNK_HEADER, *key, count))
+        for column in columns:
+            column.extend(itertools.repeat(0, padding))
+            column.tofile(self.file)
+
+    def close(self):
+        self.flush_chunk()
+        self.writer.shutdown(wait=True)
+        self.file.close()
+
+
+class SessionReader:
+    """Memory-mapped view of a .mfrec file.
+
+    Chunks are read straight out of the mapping, so opening and seeking cost
+    the same for a minute or an hour of recording, and iteration only ever
+    decodes one chunk at a time.
+    """
+
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = struct.calcsize(SESSION_HEADER)
+        if len(self.map) < header_size:
+            raise ValueError("%s: not a recording" % path)
+        magic, version, capacity, self.started = struct.unpack_from(
+            SESSION_HEADER, self.map
+        )
+        if magic != SESSION_MAGIC or version not in (1, SESSION_VERSION):
+            raise ValueError("%s: not a recording" % path)
+        self.version = version
+        self.capacity = capacity
+        dtype = chunk_dtype(capacity, version)
+        count = (len(self.map) - header_size) // dtype.itemsize
+        self.chunks = np.frombuffer(
+            self.map, dtype=dtype, count=count, offset=header_size
+        )
+        self.starts = np.concatenate(([0], np.cumsum(self.chunks["count"])))
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    @property
+    def duration(self):
+        if not len(self):
+            return 0.0
+        t, _, _, _ = self.chunk(len(self.chunks) - 1)
+        return float(t[-1] - self.chunks["t0"][0])
+
+    def chunk(self, index):
+        """Decode chunk `index` into (t, x, y, flags) arrays."""
+        import numpy as np
+
+        chunk = self.chunks[index]
+        count = chunk["count"]
+        t = chunk["t0"] + np.cumsum(chunk["dt"][:count], dtype=np.float64)
+        x = chunk["x0"] + np.cumsum(chunk["dx"][:count], dtype=np.int64)
+        y = chunk["y0"] + np.cumsum(chunk["dy"][:count], dtype=np.int64)
+        return t, x, y, chunk["flags"][:count].copy()
+
+    def laser(self, index):
+        """Decode the laser centres of chunk `index` into (x, y) arrays."""
+        import numpy as np
+
+        chunk = self.chunks[index]
+        count = chunk["count"]
+        x = chunk["lx0"] + np.cumsum(chunk["dlx"][:count], dtype=np.int64)
+        y = chunk["ly0"] + np.cumsum(chunk["dly"][:count], dtype=np.int64)
+        return x, y
+
+    def seek(self, seconds):
+        """(chunk, offset) of the first record at `seconds` into the session."""
+        import numpy as np
+
+        if not len(self):
+            return 0, 0
+        t = self.chunks["t0"][0] + seconds
+        index = max(int(np.searchsorted(self.chunks["t0"], t, "right")) - 1, 0)
+        times = self.chunk(index)[0]
+        offset = int(np.searchsorted(times, t))
+        if offset == len(times):
+            index, offset = index + 1, 0
+        return index, offset
+
+    def records(self, index=0, offset=0):
+        """Yield (t, x, y, flags) from a seek position, one chunk at a time."""
+        for index in range(index, len(self.chunks)):
+            t, x, y, flags = self.chunk(index)
+            yield from zip(
+                t[offset:].tolist(),
+                x[offset:].tolist(),
+                y[offset:].tolist(),
+                flags[offset:].tolist(),
+            )
+            offset = 0
+
+    def __iter__(self):
+        for t, x, y, _ in self.records():
+            yield t, x, y
+
+    def close(self):
+        self.chunks = None
+        self.map.close()
+
+
+class SessionPlayer(QtCore.QObject):
+    """Plays a recording back on the GUI thread with its original timing.
+
+    Each tick emits the records whose flags changed since the last one and
+    then the newest position, so state toggles are never skipped but
+    positions are coalesced to the tick rate.
+    """
+
+    record = QtCore.pyqtSignal(int, int, int)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, reader, start=0.0, speed=1.0, interval=8, parent=None):
+        super().__init__(parent)
+        self.reader = reader
+        self.speed = speed
+        self.index, self.offset = reader.seek(start)
+        self.columns = None
+        self.flags = None
+        self.origin = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        if self.index < len(self.reader.chunks):
+            self.columns = self.reader.chunk(self.index)
+            self.origin = (time.perf_counter(), self.columns[0][self.offset])
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        import numpy as np
+
+        if self.columns is None:
+            self.timer.stop()
+            self.finished.emit()
+            return
+        now = self.origin[1] + (time.perf_counter() - self.origin[0]) * self.speed
+        while True:
+            t, x, y, flags = self.columns
+            end = int(np.searchsorted(t, now, "right"))
+            for i in range(self.offset, end):
+                if flags[i] != self.flags:
+                    self.flags = int(flags[i])
+                    self.record.emit(int(x[i]), int(y[i]), self.flags)
+            if end > self.offset:
+                self.record.emit(int(x[end - 1]), int(y[end - 1]), self.flags)
+            if end < len(t):
+                self.offset = end
+                return
+            self.index += 1
+            self.offset = 0
+            if self.index == len(self.reader.chunks):
+                self.columns = None
+                return
+            self.columns = self.reader.chunk(self.index)
+
+
+STREAM_PORT = 47474
+STREAM_KEY = 0x80  # flags bit: the packet carries an absolute position
+STREAM_KEY_INTERVAL = 8
+STREAM_HEARTBEAT = 0.5  # seconds between repeated key packets on an idle stream
+STREAM_REORDER_WINDOW = 64  # older key packets mean the sender restarted
+STREAM_KEY_PACKET = "<BHHH"  # flags, sequence, x, y
+STREAM_DELTA_PACKET = "<BHbb"  # flags, sequence, dx, dy
+
+
+class StreamSender:
+    """Streams laser positions and state to a StreamReceiver over UDP.
+
+    Positions are normalised to the target screen and quantised to 16 bits.
+    Small moves are sent as 8-bit deltas from the previous packet, with an
+    absolute key packet at least every STREAM_KEY_INTERVAL packets and on
+    every state change. While nothing is posted the last key packet is
+    repeated every `heartbeat` seconds, so a lost state change or delta is
+    recovered even when the laser is hidden or still. `post` only stores the
+    newest sample; a dedicated thread encodes and sends it, so the GUI thread
+    never touches the socket.
+    """
+
+    def __init__(self, host, port=STREAM_PORT, heartbeat=STREAM_HEARTBEAT):
+        self.address = (host, port)
+        self.heartbeat = heartbeat
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.seq = 0
+        self.last = None
+        self.since_key = 0
+        self.sent = 0
+        self.latest = None
+        self.stopped = False
+        self.ready = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def post(self, x, y, flags):
+        with self.ready:
+            self.latest = (x, y, flags)
+            self.ready.notify()
+
+    def run(self):
+        while True:
+            with self.ready:
+                if self.latest is None and not self.stopped:
+                    self.ready.wait(self.heartbeat)
+                if self.stopped:
+                    return
+                sample = self.latest
+                self.latest = None
+            if sample is not None:
+                self.send(self.encode(*sample))
+            elif self.last is not None:
+                self.seq = (self.seq + 1) & 0xFFFF
+                self.send(self.key_packet())
+
+    def encode(self, x, y, flags):
+        x = min(max(int(x * 65535 + 0.5), 0), 65535)
+        y = min(max(int(y * 65535 + 0.5), 0), 65535)
+        self.seq = (self.seq + 1) & 0xFFFF
+        last = self.last
+        self.last = (x, y, flags)
+        if (
+            last is not None
+            and last[2] == flags
+            and self.since_key < STREAM_KEY_INTERVAL
+            and -128 <= x - last[0] <= 127
+            and -128 <= y - last[1] <= 127
+        ):
+            self.since_key += 1
+            return struct.pack(
+                STREAM_DELTA_PACKET, flags, self.seq, x - last[0], y - last[1]
+            )
+        return self.key_packet()
+
+    def key_packet(self):
+        x, y, flags = self.last
+        self.since_key = 0
+        return struct.pack(STREAM_KEY_PACKET, flags | STREAM_KEY, self.seq, x, y)
+
+    def send(self, packet):
+        try:
+            self.socket.sendto(packet, self.address)
+            self.sent += 1
+        except OSError as e:
+            log.debug("stream send failed: %s", e)
+
+    def close(self):
+        with self.ready:
+            self.stopped = True
+            self.ready.notify()
+        self.thread.join()
+        self.socket.close()
+
+
+class StreamReceiver(CursorSource):
+    """Receives a StreamSender's packets on a dedicated select() thread.
+
+    Packets older than the newest one seen are dropped, as are deltas whose
+    base packet was lost; the stream resumes with the next key packet. A key
+    packet far behind the newest one is taken as a restarted sender.
+    Positions are scaled onto `area` (left, top, width, height) and pushed
+    to the sink; state changes go to `on_flags`, from the I/O thread.
+    """
+
+    def __init__(self, port=STREAM_PORT, bind="", on_flags=None):
+        super().__init__()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((bind, port))
+        self.on_flags = on_flags
+        self.area = (0, 0, 65536, 65536)
+        self.thread = None
+        self.wakeup = None
+        self.received = 0
+        self.applied = 0
+
+    def start(self, sink):
+        super().start(sink)
+        self.wakeup = os.pipe()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            os.write(self.wakeup[1], b"x")
+            self.thread.join()
+            for fd in self.wakeup:
+                os.close(fd)
+            self.thread = None
+        super().stop()
+
+    def close(self):
+        self.stop()
+        self.socket.close()
 
     def run(self):
+        key_size = struct.calcsize(STREAM_KEY_PACKET)
+        delta_size = struct.calcsize(STREAM_DELTA_PACKET)
+        stop_fd = self.wakeup[0]
+        seq = x = y = flags = None
         while True:
-            self.signal.emit("")
-            time.sleep(0.0333)
+            ready, _, _ = select.select([self.socket, stop_fd], [], [])
+            if stop_fd in ready:
+                return
+            try:
+                packet = self.socket.recv(64)
+            except OSError:
+                continue
+            self.received += 1
+            if len(packet) == key_size and packet[0] & STREAM_KEY:
+                new_flags, new_seq, new_x, new_y = struct.unpack(
+                    STREAM_KEY_PACKET, packet
+                )
+                new_flags &= ~STREAM_KEY
+                if seq is not None and (seq - new_seq) & 0xFFFF < STREAM_REORDER_WINDOW:
+                    continue  # stale or duplicate
+            elif len(packet) == delta_size and seq is not None:
+                new_flags, new_seq, dx, dy = struct.unpack(STREAM_DELTA_PACKET, packet)
+                if new_seq != (seq + 1) & 0xFFFF:
+                    continue  # stale, or its base was lost
+                new_x, new_y = x + dx, y + dy
+            else:
+                continue
+            seq, x, y = new_seq, new_x, new_y
+            self.applied += 1
+            if new_flags != flags:
+                flags = new_flags
+                if self.on_flags is not None:
+                    self.on_flags(flags)
+            left, top, width, height = self.area
+            self.sink(left + x * width // 65536, top + y * height // 65536)
+
+
+class FrameScheduler(QtCore.QObject):
+    """Delivers at most one cursor position per display frame.
+
+    Sources push positions through `post` from any thread; only the newest one
+    is kept and handed to the GUI thread on the next frame slot. A frame is
+    only emitted when the position changed, and the source is stopped
+    entirely while the laser is hidden, so an idle pointer costs no wakeups.
+    """
+
+    frame = QtCore.pyqtSignal(int, int)
+    wake = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = QtPollSource()
+        self.running = False
+        self.latest = None
+        self.sample_time = 0.0
+        self.pending = False
+        self.last_pos = None
+        self.last_frame = 0.0
+        # keep emitting on a still cursor until a smoothing filter settles
+        self.settling = False
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.deliver)
+        self.wake.connect(self.schedule, QtCore.Qt.QueuedConnection)
+        self.set_refresh_rate(60)
+
+    def set_refresh_rate(self, rate):
+        # QScreen.refreshRate() may report 0 on some platforms
+        if rate <= 0:
+            rate = 60
+        self.refresh_rate = rate
+        self.interval = 1.0 / rate
+        self.source.set_refresh_rate(rate)
+
+    def set_source(self, source):
+        running = self.running
+        if running:
+            self.stop()
+        self.source = source
+        source.set_refresh_rate(self.refresh_rate)
+        if running:
+            self.start()
+
+    def start(self):
+        self.running = True
+        self.last_pos = None
+        self.pending = False
+        self.source.start(self.post)
+
+    def stop(self):
+        self.running = False
+        self.source.stop()
+        self.timer.stop()
+        self.pending = False
+
+    def refresh(self):
+        # re-emit the current position even though it did not change
+        if not self.running:
+            return
+        self.last_pos = None
+        if self.latest is not None:
+            self.post(*self.latest)
+
+    def post(self, x, y):
+        self.latest = (x, y)
+        self.sample_time = time.perf_counter()
+        if not self.pending:
+            self.pending = True
+            self.wake.emit()
+
+    def schedule(self):
+        if not self.running or self.timer.isActive():
+            return
+        delay = self.last_frame + self.interval - time.perf_counter()
+        if delay <= 0:
+            self.deliver()
+        else:
+            self.timer.start(math.ceil(delay * 1000))
+
+    def deliver(self):
+        self.pending = False
+        pos = self.latest
+        if pos is None or (pos == self.last_pos and not self.settling):
+            return
+        self.last_pos = pos
+        self.last_frame = time.perf_counter()
+        self.frame.emit(pos[0], pos[1])
+        if self.settling:
+            self.timer.start(max(1, int(self.interval * 1000)))
+
+
+CURSOR_SOURCES = {
+    "qt": QtPollSource,
+    "pynput": PynputSource,
+    "evdev": EvdevSource,
+}
+
+
+class MappingTransform:
+    """Preview-to-target mapping compiled down to a scale and an offset.
+
+    `map` returns the top-left corner for a dot of the given size so that the
+    dot is centred on the mapped cursor position and stays on the target.
+    `inset` is transparent room around the pointer (halo, trail) that may
+    hang off the edge of the target.
+    """
+
+    def __init__(self, preview, target, screen, dot_width, dot_height, inset=0):
+        left, top, right, bottom = preview
+        width = right - left
+        height = bottom - top
+        if width == 0:
+            left, width = 0, 1920
+        if height == 0:
+            top, height = 0, 1080
+
+        self.screen = screen
+        self.left = left
+        self.top = top
+        self.inv_width = 1 / width
+        self.inv_height = 1 / height
+        self.sx = target.width() / width
+        self.sy = target.height() / height
+        self.ox = target.left() - left * self.sx
+        self.oy = target.top() - top * self.sy
+        self.half_width = dot_width / 2
+        self.half_height = dot_height / 2
+        self.min_x = target.left() - inset
+        self.min_y = target.top() - inset
+        self.max_x = target.left() + target.width() - dot_width + inset
+        self.max_y = target.top() + target.height() - dot_height + inset
+
+    def map(self, x, y):
+        new_x = x * self.sx + self.ox - self.half_width
+        new_y = y * self.sy + self.oy - self.half_height
+        if new_x < self.min_x:
+            new_x = self.min_x
+        elif new_x > self.max_x:
+            new_x = self.max_x
+        if new_y < self.min_y:
+            new_y = self.min_y
+        elif new_y > self.max_y:
+            new_y = self.max_y
+        return int(new_x), int(new_y)
+
+    def map_centre(self, x, y):
+        """The centre of the dot placed by `map`, in desktop coordinates."""
+        left, top = self.map(x, y)
+        return left + self.half_width, top + self.half_height
+
+    def map_local(self, x, y):
+        """Map a cursor point to the target, relative to its top-left corner."""
+        local_x = (x - self.left) * self.sx
+        local_y = (y - self.top) * self.sy
+        return local_x, local_y
+
+    def map_normalised(self, x, y):
+        """Map a cursor point to the target as fractions of its size."""
+        nx = min(max((x - self.left) * self.inv_width, 0.0), 1.0)
+        ny = min(max((y - self.top) * self.inv_height, 0.0), 1.0)
+        return nx, ny
+
+    def map_array(self, points):
+        """Map an (N, 2) array of cursor points to dot positions."""
+        import numpy as np
+
+        points = np.asarray(points, dtype=np.float64)
+        out = np.empty(points.shape, dtype=np.float64)
+        np.multiply(points[:, 0], self.sx, out=out[:, 0])
+        np.multiply(points[:, 1], self.sy, out=out[:, 1])
+        out[:, 0] += self.ox - self.half_width
+        out[:, 1] += self.oy - self.half_height
+        np.clip(out[:, 0], self.min_x, self.max_x, out=out[:, 0])
+        np.clip(out[:, 1], self.min_y, self.max_y, out=out[:, 1])
+        return out.astype(np.int32)
+
+
+class Region:
+    """A named preview rectangle mirrored onto one or more target screens."""
+
+    def __init__(self, name, left, top, right, bottom, targets):
+        self.name = name
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.targets = list(targets)
+
+    def rect(self):
+        return self.left, self.top, self.right, self.bottom
+
+    def __str__(self):
+        return "%s=%d,%d,%d,%d>%s" % (
+            (self.name,) + self.rect() + ("|".join(self.targets),)
+        )
+
+    @classmethod
+    def parse(cls, text):
+        """Parse `name=left,top,right,bottom>target|target`."""
+        name, _, rest = text.partition("=")
+        coords, separator, targets = rest.partition(">")
+        left, top, right, bottom = [int(v) for v in coords.split(",")]
+        # screen names may be empty (e.g. offscreen), so keep empty targets
+        targets = targets.split("|") if separator else []
+        return cls(name.strip(), left, top, right, bottom, targets)
+
+
+def parse_regions(text):
+    regions = []
+    for item in text.split(";"):
+        if item.strip():
+            try:
+                regions.append(Region.parse(item.strip()))
+            except ValueError:
+                log.warning("ignoring malformed region %r", item)
+    return regions
+
+
+def format_regions(regions):
+    return "; ".join(str(region) for region in regions)
+
+
+class RegionIndex:
+    """Uniform grid over the preview regions for O(1) cursor lookups.
+
+    Each cell lists the regions overlapping it, in priority order, so a lookup
+    is one dict access plus a bounds check against a region or two.
+    """
+
+    def __init__(self, regions, cell_shift=6):
+        self.shift = cell_shift
+        self.rects = []
+        self.cells = {}
+        for i, region in enumerate(regions):
+            left, right = sorted((region.left, region.right))
+            top, bottom = sorted((region.top, region.bottom))
+            self.rects.append((left, top, right, bottom))
+            for cx in range(left >> cell_shift, (right >> cell_shift) + 1):
+                for cy in range(top >> cell_shift, (bottom >> cell_shift) + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def lookup(self, x, y):
+        for i in self.cells.get((x >> self.shift, y >> self.shift), ()):
+            left, top, right, bottom = self.rects[i]
+            if left <= x < right and top <= y < bottom:
+                return i
+        return None
+
+
+CALIBRATION_MIN_SCORE = 0.6
+LAYOUT_CHECK_INTERVAL = 2000  # ms between checks of the preview's surroundings
+LAYOUT_CHANGE = 12.0  # mean grey level change of the border that recalibrates
+CALIBRATE_IDLE = 0.5  # seconds the laser must be still before a screenshot
+
+
+def gray_array(image):
+    """A QImage as a float32 numpy array of grey levels."""
+    import numpy as np
+
+    image = image.convertToFormat(QtGui.QImage.Format_Grayscale8)
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    data = image.constBits()
+    data.setsize(stride * height)
+    pixels = np.frombuffer(data, np.uint8).reshape(height, stride)[:, :width]
+    return pixels.astype(np.float32)
+
+
+def halve(image):
+    """Box-filter an array down by two in each direction."""
+    height = image.shape[0] // 2 * 2
+    width = image.shape[1] // 2 * 2
+    image = image[:height, :width]
+    total = image[0::2, 0::2] + image[1::2, 0::2]
+    total += image[0::2, 1::2]
+    total += image[1::2, 1::2]
+    total *= 0.25
+    return total
+
+
+def fft_size(n):
+    """The smallest 5-smooth length >= n; FFTs of those are fastest."""
+    best = 2 * n
+    fives = 1
+    while fives < best:
+        threes = fives
+        while threes < best:
+            size = threes
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            threes *= 3
+        fives *= 5
+    return best
+
+
+class Pyramid:
+    """2x box-filtered levels of a grey image, built on demand."""
+
+    def __init__(self, image):
+        self.levels = [image]
+
+    def level(self, depth):
+        while len(self.levels) <= depth:
+            self.levels.append(halve(self.levels[-1]))
+        return self.levels[depth]
+
+    def resized(self, width, height):
+        """Sample the image at width x height from the closest larger level."""
+        import numpy as np
+
+        base_height, base_width = self.levels[0].shape
+        depth = 0
+        while (
+            base_width >> (depth + 1) >= width and base_height >> (depth + 1) >= height
+        ):
+            depth += 1
+        image = self.level(depth)
+        rows = ((np.arange(height) + 0.5) * (image.shape[0] / height)).astype(int)
+        cols = ((np.arange(width) + 0.5) * (image.shape[1] / width)).astype(int)
+        return image[rows[:, None], cols]
+
+
+class TemplateMatcher:
+    """Normalised cross-correlation of templates against one image.
+
+    The image spectrum and its integral images are computed once, so each
+    template costs two FFTs and a few array operations for all positions.
+    """
+
+    def __init__(self, image):
+        import numpy as np
+
+        self.height, self.width = image.shape
+        self.shape = (fft_size(self.height), fft_size(self.width))
+        self.spectrum = np.fft.rfft2(image, s=self.shape)
+        self.sums = self.integral(image)
+        self.squares = self.integral(np.square(image, dtype=np.float64))
+
+    @staticmethod
+    def integral(image):
+        import numpy as np
+
+        table = np.zeros((image.shape[0] + 1, image.shape[1] + 1))
+        np.cumsum(image, axis=0, out=table[1:, 1:])
+        np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+        return table
+
+    @staticmethod
+    def windows(table, height, width):
+        return (
+            table[height:, width:]
+            - table[:-height, width:]
+            - table[height:, :-width]
+            + table[:-height, :-width]
+        )
+
+    def match(self, template):
+        """Score map over every position where `template` fits, in [-1, 1]."""
+        import numpy as np
+
+        height, width = template.shape
+        shape = self.shape
+        centred = template - template.mean()
+        norm = math.sqrt(float(np.square(centred).sum()))
+        if norm == 0:
+            return np.zeros((self.height - height + 1, self.width - width + 1))
+        product = self.spectrum * np.conj(np.fft.rfft2(centred, s=shape))
+        correlation = np.fft.irfft2(product, s=shape)
+        correlation = correlation[: self.height - height + 1, : self.width - width + 1]
+        count = height * width
+        sums = self.windows(self.sums, height, width)
+        variance = self.windows(self.squares, height, width) - sums * sums / count
+        # flat windows (a blank desktop) can't match anything
+        flat = variance < count
+        deviation = np.sqrt(np.where(flat, 1.0, variance))
+        return np.where(flat, 0.0, correlation / (deviation * norm))
+
+
+def find_preview(
+    source, target, hint=None, min_fraction=0.15, coarse_width=320, step=1.05
+):
+    """Locate a scaled-down copy of `target` inside `source`.
+
+    Both are grey arrays. Scales are searched exhaustively on a small pyramid
+    level, then the best match is refined one level at a time. A `hint`
+    rectangle (left, top, width, height) is checked first and the search is
+    skipped if it still matches. Returns (left, top, width, height, score)
+    in `source` pixels; the score is -1 if no scale fits at all.
+    """
+    import numpy as np
+
+    sources = Pyramid(source)
+    targets = Pyramid(target)
+    aspect = target.shape[0] / target.shape[1]
+
+    depth = 0
+    while source.shape[1] >> depth > coarse_width:
+        depth += 1
+    # stop refining around 1K: full-resolution FFTs would cost more than
+    # the pixel or two of accuracy they buy
+    finest = 0
+    while source.shape[1] >> finest > 1280:
+        finest += 1
+
+    image = sources.level(depth)
+    matcher = TemplateMatcher(image)
+    best = (-1.0, 0, 0, 0)
+
+    def search(widths):
+        nonlocal best
+        for width in widths:
+            if width < 1:
+                continue
+            patch = targets.resized(width, max(int(round(width * aspect)), 1))
+            if patch.shape[0] > image.shape[0] or width > image.shape[1]:
+                continue
+            scores = matcher.match(patch)
+            y, x = np.unravel_index(np.argmax(scores), scores.shape)
+            if scores[y, x] > best[0]:
+                best = (float(scores[y, x]), int(x), int(y), width)
+
+    def refine(depth, x, y, width, margin=2):
+        nonlocal image, matcher, best
+        image = sources.level(depth)
+        height = int(round((width + 1) * aspect))
+        left = max(x - margin, 0)
+        top = max(y - margin, 0)
+        crop = image[top : y + height + margin + 1, left : x + width + margin + 2]
+        image = crop
+        matcher = TemplateMatcher(crop)
+        best = (-1.0, 0, 0, 0)
+        search((width - 1, width, width + 1))
+        score, x, y, width = best
+        best = (score, x + left, y + top, width)
+
+    def result():
+        score, x, y, width = best
+        height = int(round(width * aspect))
+        return x << finest, y << finest, width << finest, height << finest, score
+
+    if hint is not None:
+        x, y, width = (max(int(value), 0) >> finest for value in hint[:3])
+        refine(finest, x, y, width)
+        if best[0] >= CALIBRATION_MIN_SCORE:
+            return result()
+        image = sources.level(depth)
+        matcher = TemplateMatcher(image)
+        best = (-1.0, 0, 0, 0)
+
+    widths = []
+    width = float(image.shape[1])
+    while width >= max(min_fraction * image.shape[1], 8):
+        widths.append(int(round(width)))
+        width /= step
+    search(sorted(set(widths), reverse=True))
+    if not best[3]:
+        return result()  # no scale fits, e.g. a portrait target
+    # narrow the scale down between the neighbouring steps
+    width = best[3]
+    search(range(int(width / step), int(width * step) + 1))
+
+    while depth > finest and best[3]:
+        depth -= 1
+        _, x, y, width = best
+        refine(depth, 2 * x, 2 * y, 2 * width)
+    return result()
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al.) on both axes with linear lead.
+
+    Jitter is removed at low speed while the cutoff rises with speed to keep
+    lag low; `lead` extrapolates the output along the filtered velocity.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0, lead=0.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.lead = lead
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = self.y = 0.0
+        self.dx = self.dy = 0.0
+        self.settled = True
+
+    @staticmethod
+    def alpha(dt, cutoff):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, t, x, y):
+        if self.t is None:
+            self.t = t
+            self.x, self.y = x, y
+            return x, y
+        dt = t - self.t
+        if dt <= 0:
+            return self.x + self.dx * self.lead, self.y + self.dy * self.lead
+        self.t = t
+
+        a_d = self.alpha(dt, self.d_cutoff)
+        self.dx += a_d * ((x - self.x) / dt - self.dx)
+        self.dy += a_d * ((y - self.y) / dt - self.dy)
+
+        cutoff = self.min_cutoff + self.beta * math.hypot(self.dx, self.dy)
+        a = self.alpha(dt, cutoff)
+        self.x += a * (x - self.x)
+        self.y += a * (y - self.y)
+
+        out_x = self.x + self.dx * self.lead
+        out_y = self.y + self.dy * self.lead
+        self.settled = abs(x - out_x) < 0.5 and abs(y - out_y) < 0.5
+        return out_x, out_y
+
+
+class KalmanFilter:
+    """Constant-velocity Kalman filter on both axes with linear lead.
+
+    Both axes share the time step and noise model, so a single covariance is
+    tracked for the pair and every update is a handful of float operations.
+    """
+
+    def __init__(self, process_noise=2000.0, measurement_noise=4.0, lead=0.0):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.lead = lead
+        self.reset()
+
+    def reset(self):
+        self.t = None
+        self.x = self.y = 0.0
+        self.vx = self.vy = 0.0
+        self.p00, self.p01, self.p11 = self.r, 0.0, 1e6
+        self.settled = True
+
+    def __call__(self, t, x, y):
+        if self.t is None:
+            self.t = t
+            self.x, self.y = x, y
+            return x, y
+        dt = t - self.t
+        if dt <= 0:
+            return self.x + self.vx * self.lead, self.y + self.vy * self.lead
+        self.t = t
+
+        # predict, white-acceleration process noise
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        q = self.q
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt**3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt**2 / 2
+        p11 = self.p11 + q * dt
+
+        # update with the measured position
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        ex = x - self.x
+        ey = y - self.y
+        self.x += k0 * ex
+        self.y += k0 * ey
+        self.vx += k1 * ex
+        self.vy += k1 * ey
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+
+        out_x = self.x + self.vx * self.lead
+        out_y = self.y + self.vy * self.lead
+        self.settled = abs(x - out_x) < 0.5 and abs(y - out_y) < 0.5
+        return out_x, out_y
+
+
+SMOOTHING_FILTERS = {
+    "none": None,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanFilter,
+}
+
+
+class PixmapCache:
+    """Decoded pointer images plus a bounded LRU of their scaled copies.
+
+    Sources are keyed by path and mtime so that replacing pointer.png on disk
+    is picked up, scaled copies additionally by scale and devicePixelRatio.
+    """
+
+    BUILTIN = ("<builtin>", 0)
+
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self.sources = {}
+        self.scaled = collections.OrderedDict()
+
+    def source_key(self, path):
+        try:
+            return (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            return self.BUILTIN
+
+    def source(self, key):
+        pixmap = self.sources.get(key)
+        if pixmap is None:
+            if key == self.BUILTIN:
+                ba = QtCore.QByteArray.fromBase64(dot_data)
+                pixmap = QtGui.QPixmap()
+                pixmap.loadFromData(ba, "PNG")
+            else:
+                pixmap = QtGui.QPixmap(key[0])
+            # forget older revisions of the same file
+            for old_key in [k for k in self.sources if k[0] == key[0]]:
+                del self.sources[old_key]
+            self.sources[key] = pixmap
+        return pixmap
+
+    def get(self, path, scale, ratio=1.0):
+        source_key = self.source_key(path)
+        key = (source_key, round(scale, 2), ratio)
+        pixmap = self.scaled.get(key)
+        if pixmap is not None:
+            self.scaled.move_to_end(key)
+            return pixmap
+
+        source = self.source(source_key)
+        pixmap = source.scaled(
+            int(source.width() * scale * ratio),
+            int(source.height() * scale * ratio),
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        self.scaled[key] = pixmap
+        while len(self.scaled) > self.capacity:
+            self.scaled.popitem(last=False)
+        return pixmap
+
+
+pixmap_cache = PixmapCache()
+
+
+POINTER_EFFECTS = ("glow", "pulse", "trail")
+
+
+def parse_effects(text):
+    """ "glow+trail" to ("glow", "trail"); "none" or "" to ()."""
+    names = set(text.split("+")) - {"", "none"}
+    unknown = names - set(POINTER_EFFECTS)
+    if unknown:
+        raise ValueError("unknown pointer effect %r" % sorted(unknown)[0])
+    return tuple(name for name in POINTER_EFFECTS if name in names)
+
+
+def is_effect_list(text):
+    try:
+        parse_effects(text)
+    except ValueError:
+        return False
+    return True
+
+
+class SpriteAtlas:
+    """The pointer and the sprites of its effects, in one pixmap.
+
+    `base` is the pointer with its glow, `rings` one pulse ring per phase,
+    each at its own size and opacity, and `trail` the fading copies drawn
+    along the trail. Every sprite is drawn at its size in the atlas, so
+    painting only copies pixels. Rects are in device pixels; `cell` is the
+    logical size of the base frame and `ring_offsets` the logical position
+    of each ring within it.
+    """
+
+    VERSION = 3
+    FPS = 30  # animation timer rate
+    TRAIL_FRAMES = 6
+    PULSE_FRAMES = 15  # ring phases per one-second pulse, at most
+    MIN_PULSE_FRAMES = 5
+    PULSE_BYTES = 16 << 20  # fewer phases for the rings of huge pointers
+
+    def __init__(self, image, sprite, effects, ratio):
+        self.effects = effects
+        self.animated = "pulse" in effects
+        self.pixmap = QtGui.QPixmap.fromImage(image)
+        self.pixmap.setDevicePixelRatio(ratio)
+        self.bytes = image.sizeInBytes()
+        pad, _, rects = self.layout(sprite, effects)
+        self.base = rects["base"]
+        self.rings = rects["rings"]
+        # logical offset of each trail copy within the pointer, and its rect
+        self.trail = [
+            (
+                round((sprite.width() - rect.width()) / 2 / ratio),
+                round((sprite.height() - rect.height()) / 2 / ratio),
+                rect,
+            )
+            for rect in rects["trail"]
+        ]
+        self.ring_offsets = [
+            QtCore.QPointF(
+                (self.base.width() - ring.width()) / 2 / ratio,
+                (self.base.height() - ring.height()) / 2 / ratio,
+            )
+            for ring in self.rings
+        ]
+        self.cell = QtCore.QSize(
+            round(self.base.width() / ratio), round(self.base.height() / ratio)
+        )
+        self.sprite = QtCore.QSize(
+            round(sprite.width() / ratio), round(sprite.height() / ratio)
+        )
+        self.pad = round(pad / ratio)
+
+    @staticmethod
+    def ring_geometry(sprite, pad):
+        """Pen width and the radius of the smallest and largest ring."""
+        radius = sprite.width() / 2
+        pen = max(2.0, radius / 3)
+        return pen, radius, radius + pad - pen / 2
+
+    @classmethod
+    def ring_sizes(cls, sprite, pad):
+        """Side of each ring sprite, with as many phases as the budget allows."""
+        cell = min(sprite.width(), sprite.height()) + 2 * pad
+        pen, small, large = cls.ring_geometry(sprite, pad)
+        for count in range(cls.PULSE_FRAMES, cls.MIN_PULSE_FRAMES - 1, -1):
+            sizes = []
+            for i in range(count):
+                radius = small + (large - small) * i / count
+                # same parity as the cell, so each ring sits on whole pixels
+                side = 2 * math.ceil(radius + pen / 2 + 1) + cell % 2
+                sizes.append(min(side, cell))
+            if 4 * sum(side * side for side in sizes) <= cls.PULSE_BYTES:
+                break
+        return sizes
+
+    @classmethod
+    def trail_sizes(cls, sprite):
+        """Size of each trail copy, cropped to the shrunken pointer."""
+        sizes = []
+        for i in range(cls.TRAIL_FRAMES):
+            # older copies are smaller and fainter
+            scale = 1 - 0.5 * (i + 1) / (cls.TRAIL_FRAMES + 1)
+            # shrink by whole pixels on both sides to stay centred
+            inset_x = int(sprite.width() * (1 - scale) / 2)
+            inset_y = int(sprite.height() * (1 - scale) / 2)
+            sizes.append(
+                QtCore.QSize(
+                    sprite.width() - 2 * inset_x, sprite.height() - 2 * inset_y
+                )
+            )
+        return sizes
+
+    @classmethod
+    def layout(cls, sprite, effects):
+        """Halo padding, atlas image size and sprite rects, in device pixels.
+
+        Sprites are packed tallest first into rows about as wide as the
+        atlas ends up tall.
+        """
+        pad = sprite.width() * 3 // 4 if {"glow", "pulse"} & set(effects) else 0
+        width = sprite.width() + 2 * pad
+        height = sprite.height() + 2 * pad
+        rings = cls.ring_sizes(sprite, pad) if "pulse" in effects else []
+        trail = cls.trail_sizes(sprite) if "trail" in effects else []
+        sizes = [("base", 0, width, height)]
+        sizes += [("rings", i, side, side) for i, side in enumerate(rings)]
+        sizes += [("trail", i, s.width(), s.height()) for i, s in enumerate(trail)]
+        sizes.sort(key=lambda item: -item[3])
+        area = sum(w * h for _, _, w, h in sizes)
+        limit = max(width, math.isqrt(area))
+        rects = {"rings": [None] * len(rings), "trail": [None] * len(trail)}
+        x = y = shelf = right = 0
+        for name, index, w, h in sizes:
+            if x and x + w > limit:
+                x, y, shelf = 0, y + shelf, 0
+            rect = QtCore.QRect(x, y, w, h)
+            if name == "base":
+                rects["base"] = rect
+            else:
+                rects[name][index] = rect
+            x += w
+            shelf = max(shelf, h)
+            right = max(right, x)
+        return pad, QtCore.QSize(right, y + shelf), rects
+
+    @classmethod
+    def render(cls, sprite, effects):
+        pad, size, rects = cls.layout(sprite, effects)
+        image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        sprite_image = sprite.toImage()
+        color = sprite_image.pixelColor(sprite.width() // 2, sprite.height() // 2)
+        radius = sprite.width() / 2
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.setPen(QtCore.Qt.NoPen)
+
+        base = rects["base"]
+        if "glow" in effects:
+            centre = QtCore.QRectF(base).center()
+            glow = QtGui.QRadialGradient(centre, radius + pad)
+            glow.setColorAt(0.0, halo_color(color, 150))
+            glow.setColorAt(radius / (radius + pad), halo_color(color, 90))
+            glow.setColorAt(1.0, halo_color(color, 0))
+            painter.setBrush(glow)
+            painter.drawEllipse(centre, radius + pad, radius + pad)
+        painter.drawPixmap(base.x() + pad, base.y() + pad, sprite)
+
+        if rects["rings"]:
+            # growing from the pointer's edge and fading out
+            width, small, large = cls.ring_geometry(sprite, pad)
+            count = len(rects["rings"])
+            painter.setBrush(QtCore.Qt.NoBrush)
+            for i, rect in enumerate(rects["rings"]):
+                phase = i / count
+                pen = QtGui.QPen(halo_color(color, round(200 * (1 - phase))))
+                pen.setWidthF(width)
+                painter.setPen(pen)
+                ring = small + (large - small) * phase
+                painter.setClipRect(rect)
+                painter.drawEllipse(QtCore.QRectF(rect).center(), ring, ring)
+            painter.setClipping(False)
+            painter.setPen(QtCore.Qt.NoPen)
+
+        for i, rect in enumerate(rects["trail"]):
+            age = (i + 1) / (cls.TRAIL_FRAMES + 1)
+            painter.setOpacity(0.6 * (1 - age))
+            painter.drawPixmap(
+                QtCore.QRectF(rect), sprite, QtCore.QRectF(sprite.rect())
+            )
+        painter.end()
+        return image
+
+
+def halo_color(color, alpha):
+    color = QtGui.QColor(color)
+    color.setAlpha(alpha)
+    return color
+
+
+class AtlasCache:
+    """Sprite atlases in memory, backed by PNG files on disk.
+
+    An atlas is rendered once per (source image, scale, effects, ratio) and
+    saved under ~/.config/mousefollow/atlas, so later runs only load it.
+    Both the atlases kept in memory and the files on disk are bounded in
+    bytes; the least recently used go first.
+    """
+
+    def __init__(self, directory=None, max_bytes=64 << 20, disk_bytes=32 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.disk_bytes = disk_bytes
+        self.bytes = 0
+        self.atlases = collections.OrderedDict()
+        # PNG compression takes longer than rendering, so it runs off the
+        # GUI thread
+        self.writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def root(self):
+        return self.directory or os.path.join(
+            os.path.expanduser("~"), ".config", "mousefollow", "atlas"
+        )
+
+    def path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.root(), digest + ".png")
+
+    def get(self, path, scale, effects, ratio=1.0, render=True):
+        """The atlas for these settings; None if it would have to be
+        rendered and `render` is false."""
+        source_key = pixmap_cache.source_key(path)
+        key = (source_key, round(scale, 2), effects, ratio, SpriteAtlas.VERSION)
+        atlas = self.atlases.get(key)
+        if atlas is not None:
+            self.atlases.move_to_end(key)
+            return atlas
+
+        sprite = pixmap_cache.get(path, scale, ratio)
+        sprite = QtGui.QPixmap(sprite)  # a copy without the ratio set
+        sprite.setDevicePixelRatio(1.0)
+        _, size, _ = SpriteAtlas.layout(sprite, effects)
+        if effects:
+            file_path = self.path(key)
+            image = QtGui.QImage(file_path)
+            if image.size() == size:
+                self.touch(file_path)
+            elif not render:
+                return None
+            else:
+                image = SpriteAtlas.render(sprite, effects)
+                self.save(image, file_path)
+        else:
+            image = sprite.toImage()
+        atlas = SpriteAtlas(image, sprite, effects, ratio)
+        self.atlases[key] = atlas
+        self.bytes += atlas.bytes
+        while self.bytes > self.max_bytes and len(self.atlases) > 1:
+            _, old = self.atlases.popitem(last=False)
+            self.bytes -= old.bytes
+        return atlas
+
+    def clear(self):
+        self.atlases.clear()
+        self.bytes = 0
+
+    def touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def save(self, image, path):
+        return self.writer.submit(self.write, QtGui.QImage(image), path)
+
+    def write(self, image, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            if image.save(temp_path, "PNG"):
+                os.replace(temp_path, path)
+        except OSError as e:
+            log.warning("could not cache pointer atlas: %s", e)
+            return
+        self.prune()
+
+    def flush(self):
+        self.writer.shutdown(wait=True)
+        self.writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def prune(self):
+        """Delete the least recently used files beyond `disk_bytes`."""
+        files = []
+        try:
+            for entry in os.scandir(self.root()):
+                if entry.name.endswith((".png", ".tmp")):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = 0
+        for _, size, path in sorted(files, reverse=True):
+            total += size
+            if total > self.disk_bytes:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+atlas_cache = AtlasCache()
 
 
 class RedDot(QtWidgets.QWidget):
+    """The laser pointer window.
+
+    It paints the pointer from its sprite atlas, with the pulse ring under it
+    and fading copies at its recent positions when those effects are on.
+    Animation only changes which atlas rects are copied; nothing is scaled
+    or rendered per frame. An atlas that is not cached yet is rendered once the
+    size has stopped changing, the plain pointer is shown until then.
+    """
+
+    visibility_changed = QtCore.pyqtSignal(bool)
+    atlas_changed = QtCore.pyqtSignal()
+    TRAIL_TIME = 0.12  # seconds a trail copy stays visible
+    RENDER_DELAY = 150  # ms without size changes before rendering an atlas
+
     def __init__(self):
         super().__init__()
         self.scale_factor = 1.7
+        self.effects = ()
+        self.frame = 0
+        self.started = time.perf_counter()
+        self.trail = collections.deque(maxlen=SpriteAtlas.TRAIL_FRAMES)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setInterval(1000 // SpriteAtlas.FPS)
+        self.timer.timeout.connect(self.animate)
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(self.RENDER_DELAY)
+        self.render_timer.timeout.connect(lambda: self.update_pixmap(render=True))
         self.initUI()
 
     def initUI(self):
-        for child in self.findChildren(QtWidgets.QLabel):
-            child.deleteLater()
-        label = QtWidgets.QLabel(self)
-        if os.path.isfile("pointer.png"):
-            pixmap = QtGui.QPixmap("pointer.png")
-        else:
-            ba = QtCore.QByteArray.fromBase64(dot_data)
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(ba, "PNG")
-        pixmap = pixmap.scaled(
-            int(pixmap.width() * self.scale_factor),
-            int(pixmap.height() * self.scale_factor),
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation,
-        )
-        label.setPixmap(pixmap)
-        self.resize(pixmap.width(), pixmap.height())
-        self.setMinimumSize(pixmap.width(), pixmap.height())
         self.setWindowFlags(
             QtCore.Qt.FramelessWindowHint
             | QtCore.Qt.WindowStaysOnTopHint
@@ -54,13 +1871,143 @@ class RedDot(QtWidgets.QWidget):
             | QtCore.Qt.WindowTransparentForInput
         )
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+        self.update_pixmap()
+
+    def update_pixmap(self, render=False):
+        # only swaps the atlas, the native window is kept alive
+        if profiler.enabled:
+            started = time.perf_counter()
+        ratio = self.devicePixelRatioF()
+        atlas = atlas_cache.get(
+            "pointer.png", self.scale_factor, self.effects, ratio, render
+        )
+        if atlas is None:
+            atlas = atlas_cache.get("pointer.png", self.scale_factor, (), ratio)
+            self.render_timer.start()
+        else:
+            self.render_timer.stop()
+        self.atlas = atlas
+        # room for trail copies up to one pointer width away; the halo
+        # padding already provides some of it
+        self.margin = 0
+        if atlas.trail:
+            self.margin = max(atlas.sprite.width() - atlas.pad, 0)
+        self.build_fragments(ratio)
+        self.trail.clear()
+        self.frame = 0
+        width = atlas.cell.width() + 2 * self.margin
+        height = atlas.cell.height() + 2 * self.margin
+        self.setMinimumSize(width, height)
+        self.resize(width, height)
+        self.update()
+        if self.isVisible() and atlas.animated:
+            self.timer.start()
+        self.atlas_changed.emit()
+        if profiler.enabled:
+            profiler.record("pixmap_rebuild", time.perf_counter() - started)
+
+    def build_fragments(self, ratio):
+        """Lay out what paintEvent draws as fragments of the atlas.
+
+        `fragments[phase][n]` draws n trail copies, the pulse ring at that
+        phase and the pointer, in one call; painting only moves the trail
+        copies.
+        """
+        atlas = self.atlas
+
+        def fragment(left, top, rect):
+            # at 1 / ratio a device pixel of the atlas lands on one of the screen
+            width = rect.width() / ratio
+            height = rect.height() / ratio
+            return QtGui.QPainter.PixmapFragment.create(
+                QtCore.QPointF(left + width / 2, top + height / 2),
+                QtCore.QRectF(rect),
+                1 / ratio,
+                1 / ratio,
+            )
+
+        base = fragment(self.margin, self.margin, atlas.base)
+        self.trail_fragments = []
+        for dx, dy, rect in atlas.trail:
+            item = fragment(dx, dy, rect)
+            self.trail_fragments.append((item, item.x, item.y))
+        tails = [
+            [fragment(self.margin + offset.x(), self.margin + offset.y(), rect), base]
+            for offset, rect in zip(atlas.ring_offsets, atlas.rings)
+        ] or [[base]]
+        trail = [item for item, _, _ in self.trail_fragments]
+        self.fragments = [
+            [trail[:count] + tail for count in range(len(trail) + 1)] for tail in tails
+        ]
 
     def set_scale_factor(self, factor):
-        was_visible = self.isVisible()
         self.scale_factor = factor
-        self.initUI()
-        if was_visible:
-            self.show()
+        self.update_pixmap()
+
+    def inset(self):
+        """Transparent room between the window edge and the pointer."""
+        return self.atlas.pad + self.margin
+
+    def set_effects(self, effects):
+        self.effects = effects
+        self.trail.clear()
+        self.update_pixmap()
+
+    def animate(self):
+        now = time.perf_counter()
+        dirty = False
+        if self.atlas.animated:
+            count = len(self.fragments)
+            frame = int((now - self.started) * count) % count
+            if frame != self.frame:
+                self.frame = frame
+                dirty = True
+        trail = self.trail
+        while trail and now - trail[0][0] > self.TRAIL_TIME:
+            trail.popleft()
+            dirty = True
+        if dirty:
+            self.update()
+        if not self.atlas.animated and not trail:
+            self.timer.stop()
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        if self.atlas.trail and self.isVisible():
+            old = event.oldPos()
+            self.trail.append((time.perf_counter(), old.x(), old.y()))
+            self.update()
+            if not self.timer.isActive():
+                self.timer.start()
+
+    def paintEvent(self, event):
+        atlas = self.atlas
+        trail = self.trail
+        if trail:
+            x = self.x() - self.margin - atlas.pad
+            y = self.y() - self.margin - atlas.pad
+            # newest first, each older copy from a fainter atlas frame
+            for (_, old_x, old_y), (item, cx, cy) in zip(
+                reversed(trail), self.trail_fragments
+            ):
+                item.x = old_x - x + cx
+                item.y = old_y - y + cy
+        painter = QtGui.QPainter(self)
+        painter.drawPixmapFragments(
+            self.fragments[self.frame][len(trail)], atlas.pixmap
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.atlas.animated:
+            self.timer.start()
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        self.trail.clear()
+        self.visibility_changed.emit(False)
 
 
 class DrawBox(QtWidgets.QWidget):
@@ -76,36 +2023,109 @@ class DrawBox(QtWidgets.QWidget):
             QtCore.Qt.FramelessWindowHint | QtCore.Qt.WindowStaysOnTopHint
         )
         self.setWindowOpacity(0.6)
+        # the background is painted from a cached pixmap, only where damaged
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
 
         self.mouse_down_loc = [0, 0]
         self.mouse_up_loc = [0, 0]
         self.mouse_loc = [0, 0]
         self.dragging = False
+        self.background = None
+        self.painted_rect = None
+        self.damage_pending = False
+
+        # at most one repaint per display frame while dragging
+        self.frame_timer = QtCore.QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.on_frame)
+        self.set_refresh_rate(60)
+
+    def set_refresh_rate(self, rate):
+        if rate <= 0:
+            rate = 60
+        self.frame_timer.setInterval(max(1, int(1000 / rate)))
+
+    def selection_rect(self):
+        if self.dragging:
+            x, y = self.mouse_loc
+        else:
+            x, y = self.mouse_up_loc
+        ox, oy = self.mouse_down_loc
+        return QtCore.QRect(QtCore.QPoint(ox, oy), QtCore.QPoint(x, y)).normalized()
+
+    @staticmethod
+    def outline_region(rect):
+        # the four 1px edges, padded by a pixel for antialiased pens
+        region = QtGui.QRegion()
+        if rect is None:
+            return region
+        outer = rect.adjusted(-1, -1, 1, 1)
+        region += QtCore.QRect(outer.left(), outer.top(), outer.width(), 3)
+        region += QtCore.QRect(outer.left(), outer.bottom() - 2, outer.width(), 3)
+        region += QtCore.QRect(outer.left(), outer.top(), 3, outer.height())
+        region += QtCore.QRect(outer.right() - 2, outer.top(), 3, outer.height())
+        return region
+
+    def damage(self):
+        rect = self.selection_rect()
+        self.update(self.outline_region(self.painted_rect) + self.outline_region(rect))
+        self.painted_rect = rect
+
+    def request_damage(self):
+        if self.frame_timer.isActive():
+            self.damage_pending = True
+        else:
+            self.damage()
+            self.frame_timer.start()
+
+    def on_frame(self):
+        if self.damage_pending:
+            self.damage_pending = False
+            self.damage()
+            self.frame_timer.start()
 
     def keyPressEvent(self, event):
         if event.key() == QtCore.Qt.Key_Escape:
             self.hide()
-            if hasattr(self.parent(), "drawbox_visible"):
-                self.parent().drawbox_visible = False
 
     def mousePressEvent(self, event):
         self.mouse_down_loc = [event.pos().x(), event.pos().y()]
+        self.mouse_loc = self.mouse_down_loc
         self.dragging = True
-        self.update()
+        self.frame_timer.stop()
+        self.damage_pending = False
+        self.damage()
 
     def mouseReleaseEvent(self, event):
         self.mouse_up_loc = [event.pos().x(), event.pos().y()]
         self.dragging = False
-        self.update()
+        self.frame_timer.stop()
+        self.damage_pending = False
+        self.damage()
         self.mouseup.emit("")
         self.hide()
 
     def mouseMoveEvent(self, event):
         self.mouse_loc = [event.pos().x(), event.pos().y()]
+        if self.dragging:
+            self.request_damage()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.painted_rect = self.selection_rect()
         self.update()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.background = QtGui.QPixmap(self.size())
+        self.background.fill(self.palette().color(QtGui.QPalette.Window))
+
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
+        if self.background is not None:
+            for rect in event.region().rects():
+                painter.drawPixmap(rect, self.background, rect)
         painter.setPen(QtGui.QColor(255, 0, 0))
 
         if self.dragging:
@@ -124,7 +2144,473 @@ class DrawBox(QtWidgets.QWidget):
         painter.drawLine(x, y, x, oy)
 
 
+class InkOverlay(QtWidgets.QWidget):
+    """Transparent, click-through annotation layer covering a target screen.
+
+    Finished strokes are baked into a layer pixmap. Only the active stroke is
+    kept as points, in float arrays and an incrementally built QPainterPath;
+    it is simplified online and capped at `max_points`, and every new point
+    repaints just the rect of the segment it changed.
+    """
+
+    def __init__(self, color="#ff0000", width=4.0, tolerance=0.75, max_points=4096):
+        super().__init__()
+        self.setWindowFlags(
+            QtCore.Qt.FramelessWindowHint
+            | QtCore.Qt.WindowStaysOnTopHint
+            | QtCore.Qt.Tool
+            | QtCore.Qt.WindowTransparentForInput
+        )
+        self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
+        self.pen = QtGui.QPen(
+            QtGui.QColor(color),
+            width,
+            QtCore.Qt.SolidLine,
+            QtCore.Qt.RoundCap,
+            QtCore.Qt.RoundJoin,
+        )
+        self.margin = int(width) + 2
+        self.tolerance = tolerance
+        self.max_points = max_points
+        self.layer = None
+        self.xs = array.array("f")
+        self.ys = array.array("f")
+        self.path = None
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        ratio = self.devicePixelRatioF()
+        self.layer = QtGui.QPixmap(self.size() * ratio)
+        self.layer.setDevicePixelRatio(ratio)
+        self.layer.fill(QtCore.Qt.transparent)
+
+    def damage(self, *points):
+        xs = points[0::2]
+        ys = points[1::2]
+        left = int(min(xs)) - self.margin
+        top = int(min(ys)) - self.margin
+        right = int(max(xs)) + self.margin
+        bottom = int(max(ys)) + self.margin
+        self.update(left, top, right - left + 1, bottom - top + 1)
+
+    def add_point(self, x, y):
+        xs, ys = self.xs, self.ys
+        if self.path is None:
+            self.path = QtGui.QPainterPath(QtCore.QPointF(x, y))
+            xs.append(x)
+            ys.append(y)
+            self.damage(x, y)
+            return
+
+        last_x, last_y = xs[-1], ys[-1]
+        if abs(x - last_x) < self.tolerance and abs(y - last_y) < self.tolerance:
+            return
+        if len(xs) >= 2 and self.redundant(xs[-2], ys[-2], last_x, last_y, x, y):
+            # the previous point lies on the new segment: slide it forward
+            xs[-1] = x
+            ys[-1] = y
+            self.path.setElementPositionAt(self.path.elementCount() - 1, x, y)
+            self.damage(xs[-2], ys[-2], last_x, last_y, x, y)
+            return
+
+        xs.append(x)
+        ys.append(y)
+        self.path.lineTo(x, y)
+        self.damage(last_x, last_y, x, y)
+        if len(xs) >= self.max_points:
+            # bake what we have and carry on from the same point
+            self.end_stroke()
+            self.add_point(x, y)
+
+    def redundant(self, ax, ay, bx, by, cx, cy):
+        """True if b is within tolerance of the line through a and c."""
+        dx = cx - ax
+        dy = cy - ay
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return True
+        return abs(dx * (by - ay) - dy * (bx - ax)) / length <= self.tolerance
+
+    def end_stroke(self):
+        if self.path is None:
+            return
+        # the layer only exists once the overlay has been shown
+        if self.layer is not None:
+            painter = QtGui.QPainter(self.layer)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(self.pen)
+            painter.drawPath(self.path)
+            painter.end()
+        self.path = None
+        del self.xs[:]
+        del self.ys[:]
+
+    def clear(self):
+        self.end_stroke()
+        if self.layer is not None:
+            self.layer.fill(QtCore.Qt.transparent)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setClipRegion(event.region())
+        if self.layer is not None:
+            painter.drawPixmap(0, 0, self.layer)
+        if self.path is not None:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(self.pen)
+            painter.drawPath(self.path)
+
+
+class ProfilerHud(QtWidgets.QLabel):
+    """Small always-on-top readout of live p50/p99 frame timings."""
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(
+            QtCore.Qt.FramelessWindowHint
+            | QtCore.Qt.WindowStaysOnTopHint
+            | QtCore.Qt.Tool
+            | QtCore.Qt.WindowTransparentForInput
+        )
+        self.setStyleSheet(
+            "background: rgba(0, 0, 0, 160); color: white; padding: 4px;"
+            "font-family: monospace;"
+        )
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        lines = []
+        for name in Profiler.METRICS:
+            stats = profiler.percentiles(name)
+            if stats:
+                lines.append(
+                    "%-15s p50 %6.2f ms  p99 %6.2f ms"
+                    % (name, stats["p50"], stats["p99"])
+                )
+        self.setText("\n".join(lines) or "no samples yet")
+        self.adjustSize()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(500)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+
+DEFAULT_HOTKEYS = {
+    "laser": "alt_r",
+    "draw": "f9",
+    "cancel": "esc",
+    "annotate": "f8",
+    "ink": "ctrl_r",
+}
+
+
+def parse_key(name):
+    from pynput import keyboard
+
+    try:
+        return keyboard.Key[name]
+    except KeyError:
+        return keyboard.KeyCode.from_char(name)
+
+
+def key_label(name):
+    parts = name.split("_")
+    if len(parts) == 2 and parts[1] in ("l", "r"):
+        side = "Left" if parts[1] == "l" else "Right"
+        return side + " " + parts[0].title()
+    if len(name) <= 3:
+        return name.upper()
+    return name.replace("_", " ").title()
+
+
+class HotkeyDispatcher(QtCore.QObject):
+    """Turns raw listener key events into queued per-action signals.
+
+    Runs on the pynput listener thread and looks keys up in a small binding
+    table. Auto-repeat is swallowed and presses of the same action closer
+    together than `debounce` seconds are dropped.
+    """
+
+    triggered = QtCore.pyqtSignal(str, bool, float)
+
+    def __init__(self, bindings, debounce=0.05, parent=None):
+        super().__init__(parent)
+        self.debounce = debounce
+        self.held = set()
+        self.last_press = {}
+        self.set_bindings(bindings)
+
+    def set_bindings(self, bindings):
+        self.table = [(parse_key(name), action) for action, name in bindings.items()]
+
+    def lookup(self, key):
+        for bound, action in self.table:
+            if key == bound:
+                return action
+        return None
+
+    def on_press(self, key):
+        action = self.lookup(key)
+        if action is None or action in self.held:
+            return
+        self.held.add(action)
+        now = time.perf_counter()
+        if now - self.last_press.get(action, -self.debounce) < self.debounce:
+            return
+        self.last_press[action] = now
+        self.triggered.emit(action, True, now)
+
+    def on_release(self, key):
+        action = self.lookup(key)
+        if action is None:
+            return
+        self.held.discard(action)
+        self.triggered.emit(action, False, time.perf_counter())
+
+
+def between(low, high):
+    return lambda value: low <= value <= high
+
+
+def one_of(*choices):
+    return lambda value: value in choices
+
+
+# name: (type, default, validator)
+CONFIG_SCHEMA = {
+    "target_monitor": (str, "", None),
+    "preview_left": (int, 60, None),
+    "preview_right": (int, 1258, None),
+    "preview_top": (int, 149, None),
+    "preview_bottom": (int, 823, None),
+    "dot_scale": (float, 1.7, between(0.5, 5.0)),
+    "filter": (str, "none", one_of(*SMOOTHING_FILTERS)),
+    "filter_min_cutoff": (float, 1.0, between(0.0, 100.0)),
+    "filter_beta": (float, 0.007, between(0.0, 10.0)),
+    "filter_process_noise": (float, 2000.0, between(0.0, 1e9)),
+    "filter_measurement_noise": (float, 4.0, between(1e-6, 1e9)),
+    "filter_lead_ms": (float, 8.0, between(0.0, 100.0)),
+    "cursor_source": (str, "qt", one_of("replay", *CURSOR_SOURCES)),
+    "cursor_trace": (str, "", None),
+    "regions": (str, "", None),
+    "ink_color": (str, "#ff0000", QtGui.QColor.isValidColor),
+    "ink_width": (float, 4.0, between(0.5, 64.0)),
+    "region": (str, "", None),
+    "auto_calibrate": (int, 0, one_of(0, 1)),
+    "pointer_effect": (str, "none", is_effect_list),
+    "stream_mode": (str, "off", one_of("off", "send", "receive")),
+    "stream_host": (str, "", None),
+    "stream_port": (int, STREAM_PORT, between(1, 65535)),
+}
+for action, default in DEFAULT_HOTKEYS.items():
+    CONFIG_SCHEMA["hotkey_" + action] = (str, default, None)
+
+
+class Config(QtCore.QObject):
+    """Typed settings.ini store with debounced, atomic background writes.
+
+    The file is parsed once; bad or missing values fall back to the schema
+    defaults. `set` only updates memory and restarts a quiet-period timer, so
+    a burst of edits becomes a single write, done on a worker thread via a
+    temporary file and os.replace. `flush` writes synchronously, e.g. on quit.
+    """
+
+    def __init__(self, path, schema=CONFIG_SCHEMA, delay=500, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.schema = schema
+        self.values = {key: default for key, (_, default, _) in schema.items()}
+        self.extra = {}  # unknown keys are kept and written back
+        self.writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.save)
+        self.load()
+
+    def convert(self, key, value):
+        kind, _, check = self.schema[key]
+        value = kind(value)
+        if check is not None and not check(value):
+            raise ValueError("%r is out of range" % (value,))
+        return value
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            log.warning("could not read %s: %s", self.path, e)
+            return
+        for line in text.splitlines():
+            key, sep, value = line.partition(":")
+            key = key.strip()
+            value = value.strip()
+            if not sep or not key:
+                continue
+            if key not in self.schema:
+                self.extra[key] = value
+                continue
+            try:
+                self.values[key] = self.convert(key, value)
+            except ValueError as e:
+                log.warning("ignoring %s in %s: %s", key, self.path, e)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def set(self, key, value):
+        value = self.convert(key, value)
+        if self.values[key] == value:
+            return
+        self.values[key] = value
+        self.timer.start()
+
+    def update(self, values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def serialize(self):
+        items = list(self.values.items()) + list(self.extra.items())
+        return "\n".join(key + ": " + str(value) for key, value in items)
+
+    def write(self, text):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("could not write %s: %s", self.path, e)
+
+    def save(self):
+        # snapshot on the GUI thread, write on the worker
+        self.timer.stop()
+        return self.writer.submit(self.write, self.serialize())
+
+    def flush(self):
+        if self.timer.isActive():
+            self.save()
+        self.writer.shutdown(wait=True)
+        self.writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+
+# MOUSEFOLLOW_CONTROL picks another socket name, e.g. for a separate copy
+CONTROL_NAME = os.environ.get("MOUSEFOLLOW_CONTROL") or (
+    "mousefollow-" + getpass.getuser()
+)
+
+
+def parse_switch(value, current):
+    """ "on", "off" or "toggle" against the current state."""
+    if value == "toggle":
+        return not current
+    if value in ("on", "off"):
+        return value == "on"
+    raise ValueError("expected on, off or toggle, not %r" % value)
+
+
+class ControlServer(QtCore.QObject):
+    """Line-based command server on a local socket (Unix domain on Linux).
+
+    Each line is a command name and space-separated arguments. The handler
+    registered for the name runs on the GUI thread with the connection and
+    the arguments, and its result is written back as "ok ..." or, if it
+    raises, "error ...".
+    """
+
+    def __init__(self, name=CONTROL_NAME, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.handlers = {}
+        self.server = QtNetwork.QLocalServer(self)
+        self.server.setSocketOptions(QtNetwork.QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.accept)
+
+    def add(self, name, handler):
+        self.handlers[name] = handler
+
+    def listen(self):
+        # with socket options set, listen() quietly replaces an existing
+        # socket, so ask first whether an instance is behind it
+        if send_command("status", self.name) is not None:
+            log.warning("another instance owns the control socket")
+            return False
+        # nothing accepts connections: left behind by a crashed instance
+        QtNetwork.QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            log.warning("control socket unavailable: %s", self.server.errorString())
+            return False
+        return True
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self.read(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def read(self, connection):
+        while connection.canReadLine():
+            line = bytes(connection.readLine()).decode("utf-8", "replace").strip()
+            if line:
+                reply = self.execute(line, connection)
+                connection.write((reply + "\n").encode("utf-8"))
+
+    def execute(self, line, connection=None):
+        name, _, rest = line.partition(" ")
+        handler = self.handlers.get(name)
+        if handler is None:
+            return "error unknown command %r" % name
+        try:
+            result = handler(connection, *rest.split())
+        except (TypeError, ValueError) as e:
+            return "error %s" % e
+        except Exception as e:
+            # a bad command must not take the instance down
+            log.exception("control command %r failed", line)
+            return "error %s" % e
+        return "ok" if result is None else "ok " + result
+
+
+def send_command(line, name=CONTROL_NAME, timeout=500):
+    """Send one command to a running instance; None if there is none.
+
+    An instance that accepts the connection but is too busy to answer in
+    time still counts as running, and gets an "error ..." reply.
+    """
+    connection = QtNetwork.QLocalSocket()
+    connection.connectToServer(name)
+    if not connection.waitForConnected(timeout):
+        if connection.error() in (
+            QtNetwork.QLocalSocket.ServerNotFoundError,
+            QtNetwork.QLocalSocket.ConnectionRefusedError,
+        ):
+            return None
+        return "error cannot reach the running instance: " + connection.errorString()
+    connection.write((line + "\n").encode("utf-8"))
+    while not connection.canReadLine():
+        if not connection.waitForReadyRead(timeout):
+            return "error the running instance did not reply"
+    reply = bytes(connection.readLine()).decode("utf-8", "replace").strip()
+    connection.disconnectFromServer()
+    return reply
+
+
 class Master(QtWidgets.QDialog):
+    calibrated = QtCore.pyqtSignal(int, object)
+    remote_flags = QtCore.pyqtSignal(int)
+
     def __init__(self, parent=None):
         self.config_dir = (
             os.path.join(  # new directory: ~/.config/mousefollow/settings.ini
@@ -133,77 +2619,166 @@ class Master(QtWidgets.QDialog):
         )
         os.makedirs(self.config_dir, exist_ok=True)
         self.config_path = os.path.join(self.config_dir, "settings.ini")
+        self.config = Config(self.config_path)
+
+        # MOUSEFOLLOW_PROFILE=1, or a .json/.csv path to write timings to
+        profile = os.environ.get("MOUSEFOLLOW_PROFILE", "")
+        profiler.enabled = profile not in ("", "0")
+        if profile.endswith((".json", ".csv")):
+            self.timings_path = profile
+        else:
+            self.timings_path = os.path.join(self.config_dir, "timings.json")
+        self.hud = None
+        self.sessions_dir = os.path.join(self.config_dir, "sessions")
+        self.recorder = None
+        self.player = None
+        self.calibrator = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.calibration = None
+        self.layout_border = None
+        self.sender = None
+        self.receiver = None
+        self.remote_scheduler = None
+        self.remote_dot = None
+        self.control = None
+        self.control_queue = collections.deque()
+        self.control_offsets = {}
 
         super(Master, self).__init__(parent)
-        self.screens = app.screens()
-        self.drawbox_visible = False
+        self.screens = QtWidgets.qApp.screens()
+        self.dots = {}  # one RedDot per target screen name
+        self.plans = None
+        self.current_region = None
+        self.last_region = None
+        self.overlays = {}  # one InkOverlay per target screen name
+        self.ink_plans = None
+        self.annotating = False
+        self.inking = False
         self.tray_icon = None
+        self.draw_box = None
+        self.laser_visible = False  # laser visible status
+        QtWidgets.qApp.aboutToQuit.connect(self.on_quit)
         self.setupUI()
-        self.init_tray_icon()
+        startup.mark("dialog")
 
-        self.laser_visible = False  # laser visible status
-        self.alt_r_pressed = False
-        self.alt_f9_pressed = False
-        self.esc_pressed = False
+        # the rest is built once the event loop has shown the dialog
+        QtCore.QTimer.singleShot(0, self.deferred_init)
 
+    def deferred_init(self):
+        self.init_laser()
+        startup.mark("laser")
+        self.init_tray_icon()
+        startup.mark("tray icon")
+        self.watch_screens()
+        self.init_hotkeys()
+        startup.mark("hotkeys")
+        self.init_control()
+        startup.mark("control socket")
+        startup.report()
+
+    def init_hotkeys(self):
+        from pynput import keyboard
+
+        self.hotkeys = HotkeyDispatcher(self.hotkey_bindings, parent=self)
+        self.hotkeys.triggered.connect(
+            self.handle_key_event, QtCore.Qt.QueuedConnection
+        )
         self.listener = keyboard.Listener(
-            on_press=self.on_press, on_release=self.on_release
+            on_press=self.hotkeys.on_press, on_release=self.hotkeys.on_release
         )
         self.listener.start()
 
-        self.key_timer = QtCore.QTimer(self)
-        self.key_timer.timeout.connect(self.handle_key_events)
-        self.key_timer.start(30)
-
     def save_ini(self):
-        vals = [
-            "target_monitor: " + str(self.target_monitor),
-            "preview_left: " + str(self.preview_left),
-            "preview_right: " + str(self.preview_right),
-            "preview_top: " + str(self.preview_top),
-            "preview_bottom: " + str(self.preview_bottom),
-            "dot_scale: " + str(self.size_spin.value()),
-        ]
-        with open(self.config_path, "w") as f:
-            f.write("\n".join(vals))
+        values = {
+            "target_monitor": self.target_monitor,
+            "preview_left": self.preview_left,
+            "preview_right": self.preview_right,
+            "preview_top": self.preview_top,
+            "preview_bottom": self.preview_bottom,
+            "dot_scale": self.size_spin.value(),
+            "filter": self.filter_name,
+            "filter_min_cutoff": self.filter_min_cutoff,
+            "filter_beta": self.filter_beta,
+            "filter_process_noise": self.filter_process_noise,
+            "filter_measurement_noise": self.filter_measurement_noise,
+            "filter_lead_ms": self.filter_lead_ms,
+            "cursor_source": self.cursor_source,
+            "cursor_trace": self.cursor_trace,
+            "regions": format_regions(self.regions),
+            "ink_color": self.ink_color,
+            "ink_width": self.ink_width,
+            "region": self.regions[self.region_index].name,
+            "auto_calibrate": int(self.auto_calibrate),
+            "pointer_effect": self.pointer_effect,
+            "stream_mode": self.stream_mode,
+            "stream_host": self.stream_host,
+            "stream_port": self.stream_port,
+        }
+        for action, name in self.hotkey_bindings.items():
+            values["hotkey_" + action] = name
+        self.config.update(values)
 
     def load_ini(self):
-        try:
-            with open(self.config_path, "r") as f:
-                text = f.read()
-            lines = text.split("\n")
-            self.settings = {}
-            for line in lines:
-                key = line.split(":")[0]
-                val = line.split(":")[-1].strip()
-                self.settings[key] = val
-
-        except FileNotFoundError:
-            self.settings = {
-                "target_monitor": self.screens[0].name(),
-                "preview_left": "60",
-                "preview_right": "1258",
-                "preview_top": "149",
-                "preview_bottom": "823",
-                "dot_scale": "1.7",
-            }
-
-            if len(self.screens) > 1:
-                self.settings["target_monitor"] = self.screens[1].name()
-
-        self.target_monitor = self.settings["target_monitor"]
-        self.preview_left = int(self.settings["preview_left"])
-        self.preview_right = int(self.settings["preview_right"])
-        self.preview_top = int(self.settings["preview_top"])
-        self.preview_bottom = int(self.settings["preview_bottom"])
-        self.dot_scale = float(self.settings.get("dot_scale", 1.7))
+        config = self.config
+        self.target_monitor = config["target_monitor"]
+        if not self.target_monitor:
+            screen = self.screens[1] if len(self.screens) > 1 else self.screens[0]
+            self.target_monitor = screen.name()
+        self.preview_left = config["preview_left"]
+        self.preview_right = config["preview_right"]
+        self.preview_top = config["preview_top"]
+        self.preview_bottom = config["preview_bottom"]
+        self.dot_scale = config["dot_scale"]
+
+        self.filter_name = config["filter"]
+        self.filter_min_cutoff = config["filter_min_cutoff"]
+        self.filter_beta = config["filter_beta"]
+        self.filter_process_noise = config["filter_process_noise"]
+        self.filter_measurement_noise = config["filter_measurement_noise"]
+        self.filter_lead_ms = config["filter_lead_ms"]
+
+        self.cursor_source = config["cursor_source"]
+        self.cursor_trace = config["cursor_trace"]
+        self.ink_color = config["ink_color"]
+        self.ink_width = config["ink_width"]
+        self.auto_calibrate = bool(config["auto_calibrate"])
+        self.pointer_effect = config["pointer_effect"]
+        self.stream_mode = config["stream_mode"]
+        self.stream_host = config["stream_host"]
+        self.stream_port = config["stream_port"]
+
+        self.hotkey_bindings = {
+            action: config["hotkey_" + action] for action in DEFAULT_HOTKEYS
+        }
+
+        # without a region list, the legacy preview box is the only region
+        self.regions = parse_regions(config["regions"]) or [
+            Region(
+                "main",
+                self.preview_left,
+                self.preview_top,
+                self.preview_right,
+                self.preview_bottom,
+                [self.target_monitor],
+            )
+        ]
+        self.region_index = 0
+        for i, region in enumerate(self.regions):
+            if region.name == config["region"]:
+                self.region_index = i
+        self.select_region_fields()
+
+    def select_region_fields(self):
+        region = self.regions[self.region_index]
+        self.preview_left, self.preview_top = region.left, region.top
+        self.preview_right, self.preview_bottom = region.right, region.bottom
+        if region.targets:
+            self.target_monitor = region.targets[0]
 
     def setupUI(self):
         self.load_ini()
+        startup.mark("settings")
 
-        ba = QtCore.QByteArray.fromBase64(dot_data)
-        pixmap = QtGui.QPixmap()
-        pixmap.loadFromData(ba, "PNG")
+        pixmap = pixmap_cache.source(PixmapCache.BUILTIN)
 
         icon = QtGui.QIcon()
         icon.addPixmap(pixmap)
@@ -216,6 +2791,28 @@ class Master(QtWidgets.QDialog):
 
         self.v_layout = QtWidgets.QVBoxLayout(self)
 
+        self.region_layout = QtWidgets.QHBoxLayout()
+        self.region_label = QtWidgets.QLabel("Region:")
+        self.region_cb = QtWidgets.QComboBox()
+        for region in self.regions:
+            self.region_cb.addItem(region.name)
+        self.region_cb.setCurrentIndex(self.region_index)
+        self.add_region_btn = QtWidgets.QPushButton("+")
+        self.add_region_btn.setFixedWidth(28)
+        self.remove_region_btn = QtWidgets.QPushButton("-")
+        self.remove_region_btn.setFixedWidth(28)
+        self.remove_region_btn.setEnabled(len(self.regions) > 1)
+        self.region_layout.addWidget(self.region_label)
+        self.region_layout.addWidget(self.region_cb, 1)
+        self.region_layout.addWidget(self.add_region_btn)
+        self.region_layout.addWidget(self.remove_region_btn)
+        self.calibrate_btn = QtWidgets.QPushButton("Calibrate")
+        self.calibrate_btn.setToolTip(
+            "Find the preview by matching it against the target monitor"
+        )
+        self.region_layout.addWidget(self.calibrate_btn)
+        self.v_layout.addLayout(self.region_layout)
+
         self.screen_layout = QtWidgets.QHBoxLayout()
 
         self.target_monitor_label = QtWidgets.QLabel("Target Monitor:")
@@ -226,10 +2823,17 @@ class Master(QtWidgets.QDialog):
             if self.screens[i].name() == self.target_monitor:
                 self.target_monitor_cb.setCurrentIndex(i)
 
-        self.target_monitor_cb.currentIndexChanged.connect(self.set_target_monitor)
+        # mirror the laser of this region onto further screens
+        self.mirror_btn = QtWidgets.QToolButton()
+        self.mirror_btn.setText("Mirror")
+        self.mirror_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.mirror_menu = QtWidgets.QMenu(self.mirror_btn)
+        self.mirror_btn.setMenu(self.mirror_menu)
+        self.update_mirror_menu()
 
         self.screen_layout.addWidget(self.target_monitor_label)
         self.screen_layout.addWidget(self.target_monitor_cb)
+        self.screen_layout.addWidget(self.mirror_btn)
         self.v_layout.addLayout(self.screen_layout)
 
         # adjusting laser spot size
@@ -239,25 +2843,81 @@ class Master(QtWidgets.QDialog):
         self.size_spin.setRange(0.5, 5.0)
         self.size_spin.setSingleStep(0.1)
         self.size_spin.setValue(self.dot_scale)
-        self.size_spin.valueChanged.connect(self.change_dot_size)
+        self.effect_cb = QtWidgets.QComboBox()
+        for label, effect in (
+            ("No effect", "none"),
+            ("Glow", "glow"),
+            ("Pulse", "pulse"),
+            ("Trail", "trail"),
+            ("Glow + Trail", "glow+trail"),
+            ("Pulse + Trail", "pulse+trail"),
+        ):
+            self.effect_cb.addItem(label, effect)
+        if self.effect_cb.findData(self.pointer_effect) < 0:
+            # another combination set in settings.ini
+            self.effect_cb.addItem(self.pointer_effect, self.pointer_effect)
+        self.effect_cb.setCurrentIndex(self.effect_cb.findData(self.pointer_effect))
         self.size_layout.addWidget(self.size_label)
         self.size_layout.addWidget(self.size_spin)
+        self.size_layout.addWidget(self.effect_cb)
         self.v_layout.addLayout(self.size_layout)
 
-        self.draw_label = QtWidgets.QLabel("Draw: F9")
+        # optional smoothing between cursor sampling and the laser
+        self.filter_layout = QtWidgets.QHBoxLayout()
+        self.filter_label = QtWidgets.QLabel("Smoothing:")
+        self.filter_cb = QtWidgets.QComboBox()
+        self.filter_cb.addItem("None", "none")
+        self.filter_cb.addItem("One Euro", "one_euro")
+        self.filter_cb.addItem("Kalman", "kalman")
+        self.filter_cb.setCurrentIndex(self.filter_cb.findData(self.filter_name))
+        self.filter_layout.addWidget(self.filter_label)
+        self.filter_layout.addWidget(self.filter_cb)
+        self.v_layout.addLayout(self.filter_layout)
+
+        self.source_layout = QtWidgets.QHBoxLayout()
+        self.source_label = QtWidgets.QLabel("Cursor Input:")
+        self.source_cb = QtWidgets.QComboBox()
+        self.source_cb.addItem("Qt poll", "qt")
+        self.source_cb.addItem("pynput", "pynput")
+        self.source_cb.addItem("evdev", "evdev")
+        self.source_cb.addItem("Trace replay", "replay")
+        self.source_layout.addWidget(self.source_label)
+        self.source_layout.addWidget(self.source_cb)
+        self.v_layout.addLayout(self.source_layout)
+
+        self.stream_layout = QtWidgets.QHBoxLayout()
+        self.stream_label = QtWidgets.QLabel("Network:")
+        self.stream_cb = QtWidgets.QComboBox()
+        self.stream_cb.addItem("Off", "off")
+        self.stream_cb.addItem("Send to", "send")
+        self.stream_cb.addItem("Receive", "receive")
+        self.stream_cb.setCurrentIndex(self.stream_cb.findData(self.stream_mode))
+        self.stream_host_edit = QtWidgets.QLineEdit(self.stream_host)
+        self.stream_host_edit.setPlaceholderText("receiver address")
+        self.stream_host_edit.setEnabled(self.stream_mode == "send")
+        self.stream_layout.addWidget(self.stream_label)
+        self.stream_layout.addWidget(self.stream_cb)
+        self.stream_layout.addWidget(self.stream_host_edit, 1)
+        self.v_layout.addLayout(self.stream_layout)
+
+        self.draw_label = QtWidgets.QLabel(
+            "Draw: " + key_label(self.hotkey_bindings["draw"])
+        )
         self.v_layout.addWidget(self.draw_label)
 
-        self.laser_label = QtWidgets.QLabel("Laser: Right Alt")
+        self.laser_label = QtWidgets.QLabel(
+            "Laser: " + key_label(self.hotkey_bindings["laser"])
+        )
         self.v_layout.addWidget(self.laser_label)
 
-        self.red_dot = RedDot()
-        self.red_dot.set_scale_factor(self.dot_scale)
-        self.draw_box = DrawBox()
-        self.draw_box.mouseup.connect(self.save_preview_pos)
-
-        self.thread = Mover()
-        self.thread.signal.connect(self.move_dot)
-        self.thread.start()
+        self.annotate_label = QtWidgets.QLabel(
+            "Annotate: %s, hold %s to draw"
+            % (
+                key_label(self.hotkey_bindings["annotate"]),
+                key_label(self.hotkey_bindings["ink"]),
+            )
+        )
+        self.v_layout.addWidget(self.annotate_label)
 
         # an Exit Button
         self.button_layout = QtWidgets.QHBoxLayout()
@@ -270,22 +2930,209 @@ class Master(QtWidgets.QDialog):
         self.resize(300, 130)
         self.show()
 
+    def init_laser(self):
+        self.scheduler = FrameScheduler(self)
+        self.scheduler.frame.connect(self.move_dot)
+        self.update_refresh_rate()
+        self.region_lookup = RegionIndex(self.regions)
+        self.build_filter()
+        self.build_source()
+        self.source_cb.setCurrentIndex(self.source_cb.findData(self.cursor_source))
+        self.remote_flags.connect(self.apply_remote_flags)
+        self.build_stream()
+
+        self.target_monitor_cb.currentIndexChanged.connect(self.set_target_monitor)
+        self.region_cb.currentIndexChanged.connect(self.select_region)
+        self.add_region_btn.clicked.connect(self.add_region)
+        self.remove_region_btn.clicked.connect(self.remove_region)
+        self.calibrate_btn.clicked.connect(lambda: self.calibrate())
+        self.calibrated.connect(self.apply_calibration)
+        # watch the preview's surroundings for layout changes
+        self.calibrate_timer = QtCore.QTimer(self)
+        self.calibrate_timer.setInterval(LAYOUT_CHECK_INTERVAL)
+        self.calibrate_timer.timeout.connect(self.check_layout)
+        if self.auto_calibrate:
+            self.calibrate_timer.start()
+        self.mirror_menu.triggered.connect(self.set_mirrors)
+        self.size_spin.valueChanged.connect(self.change_dot_size)
+        self.effect_cb.currentIndexChanged.connect(self.set_pointer_effect)
+        self.filter_cb.currentIndexChanged.connect(self.set_filter)
+        self.source_cb.currentIndexChanged.connect(self.set_cursor_source)
+        self.stream_cb.currentIndexChanged.connect(self.set_stream_mode)
+        self.stream_host_edit.editingFinished.connect(self.set_stream_mode)
+
+    def dot_for(self, screen_name):
+        dot = self.dots.get(screen_name)
+        if dot is None:
+            dot = RedDot()
+            dot.set_scale_factor(self.size_spin.value())
+            dot.set_effects(parse_effects(self.pointer_effect))
+            dot.visibility_changed.connect(self.on_dot_visibility)
+            # a deferred atlas render changes the dot's size
+            dot.atlas_changed.connect(self.invalidate_transform)
+            self.dots[screen_name] = dot
+        return dot
+
     def change_dot_size(self, value):
-        # first simulate closing, then adjust and simulate opening again
-        was_visible = self.laser_visible
-        if was_visible:
-            self.laser_visible = False
-            self.handle_key_events()
-        self.red_dot.set_scale_factor(value)
-        if was_visible:
-            self.laser_visible = True
-            self.handle_key_events()
+        for dot in self.dots.values():
+            dot.set_scale_factor(value)
+        if self.remote_dot is not None:
+            self.remote_dot.set_scale_factor(value)
+        self.invalidate_transform()
+        self.save_ini()
+
+    def set_pointer_effect(self):
+        self.pointer_effect = self.effect_cb.currentData()
+        effects = parse_effects(self.pointer_effect)
+        for dot in self.dots.values():
+            dot.set_effects(effects)
+        if self.remote_dot is not None:
+            self.remote_dot.set_effects(effects)
+        self.invalidate_transform()
         self.save_ini()
 
     def set_target_monitor(self):
         self.target_monitor = self.target_monitor_cb.currentText()
+        region = self.regions[self.region_index]
+        mirrors = [t for t in region.targets[1:] if t != self.target_monitor]
+        region.targets = [self.target_monitor] + mirrors
+        self.update_mirror_menu()
+        self.regions_changed()
+        self.update_refresh_rate()
+
+    def update_mirror_menu(self):
+        self.mirror_menu.clear()
+        region = self.regions[self.region_index]
+        for screen in self.screens:
+            if screen.name() == self.target_monitor:
+                continue
+            action = self.mirror_menu.addAction(screen.name())
+            action.setCheckable(True)
+            action.setChecked(screen.name() in region.targets[1:])
+
+    def set_mirrors(self):
+        region = self.regions[self.region_index]
+        mirrors = [a.text() for a in self.mirror_menu.actions() if a.isChecked()]
+        region.targets = [self.target_monitor] + mirrors
+        self.regions_changed()
+
+    def select_region(self, index):
+        if index < 0:
+            return
+        self.region_index = index
+        self.select_region_fields()
+        self.target_monitor_cb.blockSignals(True)
+        self.target_monitor_cb.setCurrentIndex(
+            self.target_monitor_cb.findText(self.target_monitor)
+        )
+        self.target_monitor_cb.blockSignals(False)
+        self.update_mirror_menu()
+        self.update_refresh_rate()
+        self.save_ini()
+
+    def add_region(self):
+        names = set(region.name for region in self.regions)
+        number = len(self.regions) + 1
+        while "Region %d" % number in names:
+            number += 1
+        current = self.regions[self.region_index]
+        region = Region(
+            "Region %d" % number, *current.rect(), targets=[self.target_monitor]
+        )
+        self.regions.append(region)
+        self.region_cb.addItem(region.name)
+        self.remove_region_btn.setEnabled(True)
+        self.region_cb.setCurrentIndex(len(self.regions) - 1)
+        self.regions_changed()
+
+    def remove_region(self):
+        if len(self.regions) < 2:
+            return
+        index = self.region_index
+        del self.regions[index]
+        self.region_index = min(index, len(self.regions) - 1)
+        self.region_cb.blockSignals(True)
+        self.region_cb.removeItem(index)
+        self.region_cb.setCurrentIndex(self.region_index)
+        self.region_cb.blockSignals(False)
+        self.remove_region_btn.setEnabled(len(self.regions) > 1)
+        self.select_region(self.region_index)
+        self.regions_changed()
+
+    def regions_changed(self):
+        self.region_lookup = RegionIndex(self.regions)
+        self.current_region = None
+        self.last_region = None
+        self.invalidate_transform()
+        if self.laser_visible:
+            self.update_laser()
+        self.save_ini()
+
+    def update_refresh_rate(self):
+        # pace frames to the monitor the laser is drawn on
+        for screen in self.screens:
+            if screen.name() == self.target_monitor_cb.currentText():
+                self.scheduler.set_refresh_rate(screen.refreshRate())
+                break
+
+    def build_filter(self):
+        lead = self.filter_lead_ms / 1000
+        if self.filter_name == "one_euro":
+            self.filter = OneEuroFilter(
+                self.filter_min_cutoff, self.filter_beta, lead=lead
+            )
+        elif self.filter_name == "kalman":
+            self.filter = KalmanFilter(
+                self.filter_process_noise, self.filter_measurement_noise, lead=lead
+            )
+        else:
+            self.filter = None
+        self.scheduler.settling = False
+
+    def set_filter(self):
+        self.filter_name = self.filter_cb.currentData()
+        self.build_filter()
         self.save_ini()
 
+    def build_source(self):
+        try:
+            if self.cursor_source == "replay":
+                source = ReplaySource.from_file(self.cursor_trace)
+            else:
+                source = CURSOR_SOURCES[self.cursor_source]()
+        except (ImportError, OSError, KeyError, ValueError) as e:
+            log.warning(
+                "cursor input %r unavailable (%s), polling Qt instead",
+                self.cursor_source,
+                e,
+            )
+            self.cursor_source = "qt"
+            source = QtPollSource()
+        self.scheduler.set_source(source)
+
+    def set_cursor_source(self):
+        self.cursor_source = self.source_cb.currentData()
+        self.build_source()
+        self.source_cb.blockSignals(True)
+        self.source_cb.setCurrentIndex(self.source_cb.findData(self.cursor_source))
+        self.source_cb.blockSignals(False)
+        self.save_ini()
+
+    def on_dot_visibility(self):
+        running = self.annotating or any(dot.isVisible() for dot in self.dots.values())
+        if running != self.scheduler.running:
+            self.set_scheduler_running(running)
+
+    def set_scheduler_running(self, running):
+        if running and self.player is not None:
+            return  # the recording drives move_dot instead
+        if running:
+            if self.filter is not None:
+                self.filter.reset()
+            self.scheduler.start()
+        else:
+            self.scheduler.stop()
+
     def save_preview_pos(self):
         drawbox_geometry = self.draw_box.geometry()
 
@@ -305,115 +3152,587 @@ class Master(QtWidgets.QDialog):
                 self.preview_top,
             )
 
-        self.save_ini()
-
-    def move_dot(self):
-        if self.red_dot.isVisible():
-            laser_width = self.red_dot.frameGeometry().width()
-            laser_height = self.red_dot.frameGeometry().height()
-
-            pos = QtGui.QCursor().pos()
-            x = pos.x()
-            y = pos.y()
-
-            width = self.preview_right - self.preview_left
-            height = self.preview_bottom - self.preview_top
-
-            if width == 0:
-                self.preview_left = 0
-                self.preview_right = 1920
-                width = self.preview_right - self.preview_left
-
-            if height == 0:
-                self.preview_top = 0
-                self.preview_bottom = 1080
-                height = self.preview_bottom - self.preview_top
-
-            x_fac = (x - self.preview_left) / width
-            y_fac = (y - self.preview_top) / height
-
-            for screen in self.screens:
-                if screen.name() == self.target_monitor_cb.currentText():
-                    target_screen = screen
-                    break
-
-            geometry = target_screen.geometry()
-            new_x = geometry.left() + (geometry.width() * x_fac) - (laser_width / 2)
-            new_y = geometry.top() + (geometry.height() * y_fac) - (laser_height / 2)
+        region = self.regions[self.region_index]
+        region.left, region.top = self.preview_left, self.preview_top
+        region.right, region.bottom = self.preview_right, self.preview_bottom
+        self.regions_changed()
 
-            if new_x < geometry.left():
-                new_x = geometry.left()
-            elif new_x > geometry.left() + geometry.width() - laser_width:
-                new_x = geometry.left() + geometry.width() - laser_width
-
-            if new_y < geometry.top():
-                new_y = geometry.top()
-            elif new_y > geometry.top() + geometry.height() - laser_width:
-                new_y = geometry.top() + geometry.height() - laser_width
-
-            self.red_dot.move(int(new_x), int(new_y))
+    def source_screen(self, region, target):
+        """The screen showing the region's preview, other than `target`."""
+        centre = QtCore.QPoint(
+            (region.left + region.right) // 2, (region.top + region.bottom) // 2
+        )
+        screen = QtGui.QGuiApplication.screenAt(centre)
+        if screen is None or screen is target:
+            others = [screen for screen in self.screens if screen is not target]
+            screen = others[0] if others else None
+        return screen
+
+    def calibration_screens(self, region):
+        """The (source, target) screens of a region, or None."""
+        screens = {screen.name(): screen for screen in self.screens}
+        target = screens.get(region.targets[0]) if region.targets else None
+        source = self.source_screen(region, target) if target else None
+        if source is None:
+            return None
+        return source, target
+
+    def preview_border(self, screen, rect):
+        """Grey levels of a thin frame just outside the preview.
+
+        It shows the presenter console around the preview, so it changes with
+        the window layout but not with the slide, and grabbing it is cheap.
+        """
+        import numpy as np
+
+        geometry = screen.geometry()
+        left = rect[0] - geometry.left()
+        top = rect[1] - geometry.top()
+        width = rect[2] - rect[0]
+        height = rect[3] - rect[1]
+        strips = (
+            (left - 6, top - 6, width + 12, 4),
+            (left - 6, top + height + 2, width + 12, 4),
+            (left - 6, top, 4, height),
+            (left + width + 2, top, 4, height),
+        )
+        parts = []
+        for x, y, w, h in strips:
+            image = screen.grabWindow(0, x, y, w, h).toImage()
+            if image.isNull():
+                return None
+            parts.append(gray_array(image).ravel())
+        return np.concatenate(parts)
+
+    def check_layout(self):
+        """Recalibrate when the preview's surroundings have changed.
+
+        Only a thin border is grabbed here; the full screenshots are taken
+        on a change, and not while the laser is moving.
+        """
+        if self.calibration is not None and not self.calibration.done():
+            return
+        if time.perf_counter() - self.scheduler.last_frame < CALIBRATE_IDLE:
+            return  # try again at the next check
+        index = self.region_index
+        region = self.regions[index]
+        screens = self.calibration_screens(region)
+        if screens is None:
+            return
+        rect = region.rect()
+        border = self.preview_border(screens[0], rect)
+        if border is None:
+            return
+        old = self.layout_border
+        self.layout_border = (index, rect, border)
+        if old is not None and old[:2] != (index, rect):
+            return  # the region was edited, this is the new baseline
+        if old is not None and old[2].shape == border.shape:
+            if float(abs(old[2] - border).mean()) < LAYOUT_CHANGE:
+                return
+        self.calibrate(background=True)
+
+    def calibrate(self, background=False):
+        """Locate the selected region's preview from screenshots.
+
+        The screens are grabbed here; matching runs on a worker thread and
+        its result comes back through `calibrated`.
+        """
+        if self.calibration is not None and not self.calibration.done():
+            return
+        index = self.region_index
+        region = self.regions[index]
+        screens = self.calibration_screens(region)
+        if screens is None:
+            if not background:
+                log.warning("calibration needs the preview and target on two screens")
+            return
+        source, target = screens
+        source_image = source.grabWindow(0).toImage()
+        target_image = target.grabWindow(0).toImage()
+        if source_image.isNull() or target_image.isNull():
+            log.warning("could not take screenshots for calibration")
+            return
+        geometry = source.geometry()
+        ratio = source_image.width() / max(geometry.width(), 1)
+        hint = None
+        if background:
+            hint = (
+                (region.left - geometry.left()) * ratio,
+                (region.top - geometry.top()) * ratio,
+                (region.right - region.left) * ratio,
+            )
+        self.calibration = self.calibrator.submit(
+            lambda: find_preview(
+                gray_array(source_image), gray_array(target_image), hint=hint
+            )
+        )
+        self.calibration.add_done_callback(
+            lambda future: self.calibrated.emit(
+                index, (geometry, ratio, background, future)
+            )
+        )
 
-    def on_press(self, key):
+    def apply_calibration(self, index, result):
+        geometry, ratio, background, future = result
         try:
-            if key == keyboard.Key.alt_r:  # origin: Alt_l
-                if not self.alt_r_pressed:
-                    self.laser_visible = not self.laser_visible
-                self.alt_r_pressed = True
-            elif key == keyboard.Key.f9:  # origin: Alt_r
-                self.alt_f9_pressed = True
-            elif key == keyboard.Key.esc:
-                self.esc_pressed = True
-        except Exception:
-            pass
+            left, top, width, height, score = future.result()
+        except Exception as e:
+            # runs in a slot, where an exception would abort the app
+            log.warning("calibration failed: %s", e)
+            return
+        if score < CALIBRATION_MIN_SCORE or index >= len(self.regions):
+            # a background check of an off-screen preview is not news
+            log.log(
+                logging.DEBUG if background else logging.INFO,
+                "preview not found on screen (best match %.2f)",
+                score,
+            )
+            return
+        rect = (
+            geometry.left() + round(left / ratio),
+            geometry.top() + round(top / ratio),
+            geometry.left() + round((left + width) / ratio),
+            geometry.top() + round((top + height) / ratio),
+        )
+        region = self.regions[index]
+        if rect == region.rect():
+            return
+        log.info("calibrated %s to %s (match %.2f)", region.name, rect, score)
+        region.left, region.top, region.right, region.bottom = rect
+        if index == self.region_index:
+            self.select_region_fields()
+        self.regions_changed()
+
+    def set_auto_calibrate(self, enabled):
+        self.auto_calibrate = enabled
+        self.layout_border = None
+        if enabled:
+            self.calibrate_timer.start()
+        else:
+            self.calibrate_timer.stop()
+        self.save_ini()
 
-    def on_release(self, key):
+    def build_stream(self):
+        if self.sender is not None:
+            self.sender.close()
+            self.sender = None
+        if self.receiver is not None:
+            self.remote_scheduler.stop()
+            self.receiver.close()
+            self.receiver = None
+            self.remote_dot.hide()
         try:
-            if key == keyboard.Key.alt_r:  # origin: Alt_l
-                self.alt_r_pressed = False
-            elif key == keyboard.Key.f9:  # origin: Alt_r
-                self.alt_f9_pressed = False
-            elif key == keyboard.Key.esc:
-                self.esc_pressed = False
-        except Exception:
-            pass
+            if self.stream_mode == "send" and self.stream_host:
+                self.sender = StreamSender(self.stream_host, self.stream_port)
+            elif self.stream_mode == "receive":
+                self.receiver = StreamReceiver(
+                    self.stream_port, on_flags=self.remote_flags.emit
+                )
+        except OSError as e:
+            log.warning("network stream unavailable: %s", e)
+            return
+        if self.receiver is not None:
+            if self.remote_dot is None:
+                self.remote_dot = RedDot()
+                self.remote_dot.set_scale_factor(self.size_spin.value())
+                self.remote_dot.set_effects(parse_effects(self.pointer_effect))
+                self.remote_scheduler = FrameScheduler(self)
+                self.remote_scheduler.frame.connect(self.move_remote_dot)
+            self.remote_scheduler.set_source(self.receiver)
+            self.remote_scheduler.set_refresh_rate(self.scheduler.refresh_rate)
+            self.update_remote_area()
+            self.remote_scheduler.start()
+
+    def set_stream_mode(self):
+        self.stream_mode = self.stream_cb.currentData()
+        self.stream_host = self.stream_host_edit.text().strip()
+        self.stream_host_edit.setEnabled(self.stream_mode == "send")
+        self.build_stream()
+        self.save_ini()
 
-    def handle_key_events(self):
-        if self.laser_visible and not self.red_dot.isVisible():
-            self.red_dot.show()
-        if not self.laser_visible and self.red_dot.isVisible():
-            self.red_dot.hide()
-
-        if self.alt_f9_pressed and not self.drawbox_visible:
-            pos = QtGui.QCursor().pos()
-            x = pos.x()
-            y = pos.y()
-            for screen in self.screens:
+    def update_remote_area(self):
+        if self.receiver is None:
+            return
+        for screen in self.screens:
+            if screen.name() == self.target_monitor:
                 geometry = screen.geometry()
-                left = geometry.left()
-                top = geometry.top()
-                width = geometry.width()
-                height = geometry.height()
-                if x >= left and x < left + width and y >= top and y < top + height:
-                    source_screen = screen
-                    break
-            self.draw_box.setGeometry(source_screen.geometry())
-            self.draw_box.show()
-            self.draw_box.raise_()
-            self.draw_box.activateWindow()
-            self.draw_box.setFocus()
-            self.drawbox_visible = True
-        elif (
-            not self.alt_f9_pressed
-            and self.drawbox_visible
-            and not self.draw_box.isVisible()
-        ):
-            self.drawbox_visible = False
+                self.receiver.area = (
+                    geometry.left(),
+                    geometry.top(),
+                    geometry.width(),
+                    geometry.height(),
+                )
+                break
+
+    def stream_position(self, index, x, y):
+        if self.plans[index]:
+            _, transform = self.plans[index][0]
+            nx, ny = transform.map_normalised(x, y)
+            self.sender.post(nx, ny, self.session_flags())
+
+    def move_remote_dot(self, x, y):
+        dot = self.remote_dot
+        dot.move(x - dot.width() // 2, y - dot.height() // 2)
+
+    def apply_remote_flags(self, flags):
+        if self.remote_dot is None:
+            return
+        if flags & FLAG_LASER:
+            self.remote_dot.show()
+            self.remote_dot.raise_()
+        else:
+            self.remote_dot.hide()
+
+    def watch_screens(self):
+        app = QtWidgets.qApp
+        app.screenAdded.connect(self.on_screens_changed)
+        app.screenRemoved.connect(self.on_screens_changed)
+        for screen in self.screens:
+            screen.geometryChanged.connect(self.on_screen_geometry)
+
+    def on_screens_changed(self, screen=None):
+        self.screens = QtWidgets.qApp.screens()
+        for screen in self.screens:
+            try:
+                screen.geometryChanged.disconnect(self.on_screen_geometry)
+            except TypeError:
+                pass
+            screen.geometryChanged.connect(self.on_screen_geometry)
+        self.on_screen_geometry()
+        self.update_refresh_rate()
+        self.update_mirror_menu()
+
+    def on_screen_geometry(self, *args):
+        # the next layout check recalibrates
+        self.layout_border = None
+        self.invalidate_transform()
+
+    def invalidate_transform(self, *args):
+        self.plans = None
+        self.ink_plans = None
+        self.place_overlays()
+        self.update_remote_area()
+        # re-place the dot on the next frame even if the cursor is still
+        self.scheduler.refresh()
+
+    def build_plans(self):
+        """Compile, per region, the (dot, transform) pairs of its targets."""
+        screens = {screen.name(): screen for screen in self.screens}
+        plans = []
+        for region in self.regions:
+            plan = []
+            for name in region.targets:
+                screen = screens.get(name)
+                if screen is None:
+                    continue
+                dot = self.dot_for(name)
+                transform = MappingTransform(
+                    region.rect(),
+                    screen.geometry(),
+                    screen,
+                    dot.width(),
+                    dot.height(),
+                    dot.inset(),
+                )
+                plan.append((dot, transform))
+            plans.append(plan)
+        self.plans = plans
+
+    def activate_region(self, index):
+        self.current_region = index
+        if self.plans is None:
+            self.build_plans()
+        active = set(dot for dot, _ in self.plans[index])
+        # show the new dots before hiding the old, so the scheduler keeps going
+        for dot in active:
+            if not dot.isVisible():
+                dot.show()
+        for dot in self.dots.values():
+            if dot not in active and dot.isVisible():
+                dot.hide()
+
+    def move_dot(self, x, y):
+        if profiler.enabled:
+            started = time.perf_counter()
+        cursor_x, cursor_y = x, y
+        if self.plans is None:
+            self.build_plans()
+        if self.filter is not None:
+            x, y = self.filter(time.perf_counter(), x, y)
+            self.scheduler.settling = not self.filter.settled
+        index = self.region_lookup.lookup(int(x), int(y))
+        if self.inking:
+            self.ink_point(index, x, y)
+        if index is None:
+            # outside every region: stay on the last one, clamped
+            index = self.last_region
+            if index is None:
+                index = self.region_index
+        self.last_region = index
+        if self.recorder is not None:
+            plan = self.plans[index]
+            self.recorder.append(
+                time.perf_counter(),
+                cursor_x,
+                cursor_y,
+                self.session_flags(),
+                plan[0][1].map_centre(x, y) if plan else None,
+            )
+        if self.sender is not None:
+            self.stream_position(index, x, y)
+        if self.laser_visible:
+            if index != self.current_region:
+                self.activate_region(index)
+            for dot, transform in self.plans[index]:
+                dot.move(*transform.map(x, y))
+            if profiler.enabled:
+                profiler.frame(started, self.scheduler.sample_time)
+
+    def overlay_for(self, screen):
+        overlay = self.overlays.get(screen.name())
+        if overlay is None:
+            overlay = InkOverlay(self.ink_color, self.ink_width)
+            overlay.setGeometry(screen.geometry())
+            self.overlays[screen.name()] = overlay
+        if self.annotating and overlay.isHidden():
+            # e.g. a target or mirror added while annotating
+            overlay.show()
+            self.raise_dots()
+        return overlay
+
+    def place_overlays(self):
+        screens = {screen.name(): screen for screen in self.screens}
+        for name, overlay in self.overlays.items():
+            screen = screens.get(name)
+            if screen is None:
+                overlay.hide()  # shown again if the screen comes back
+            elif overlay.geometry() != screen.geometry():
+                overlay.setGeometry(screen.geometry())
+
+    def raise_dots(self):
+        # keep the laser above the ink
+        for dot in self.dots.values():
+            if dot.isVisible():
+                dot.raise_()
+
+    def build_ink_plans(self):
+        if self.plans is None:
+            self.build_plans()
+        self.ink_plans = [
+            [(self.overlay_for(transform.screen), transform) for _, transform in plan]
+            for plan in self.plans
+        ]
 
-        if self.esc_pressed:
-            if self.drawbox_visible:
-                self.draw_box.hide()
-                self.drawbox_visible = False
-            self.esc_pressed = False
+    def ink_point(self, index, x, y):
+        if self.ink_plans is None:
+            self.build_ink_plans()
+        if index != self.last_region or index is None:
+            # lift the pen when leaving a region
+            for overlay in self.overlays.values():
+                overlay.end_stroke()
+            if index is None:
+                return
+        for overlay, transform in self.ink_plans[index]:
+            overlay.add_point(*transform.map_local(x, y))
+
+    def set_annotating(self, annotating):
+        self.annotating = annotating
+        self.inking = False
+        if annotating:
+            self.build_ink_plans()  # shows the overlays
+        else:
+            for overlay in self.overlays.values():
+                overlay.clear()
+                overlay.hide()
+        self.on_dot_visibility()
+
+    def set_inking(self, inking):
+        self.inking = inking and self.annotating
+        if not self.inking:
+            for overlay in self.overlays.values():
+                overlay.end_stroke()
+
+    def handle_key_event(self, action, pressed, stamp):
+        if profiler.enabled:
+            profiler.record("hotkey", time.perf_counter() - stamp)
+        if action == "ink":
+            self.set_inking(pressed)
+        elif not pressed:
+            return
+        elif action == "annotate":
+            self.set_annotating(not self.annotating)
+        elif action == "laser":
+            self.laser_visible = not self.laser_visible
+            self.update_laser()
+        elif action == "draw":
+            self.show_draw_box()
+        elif action == "cancel" and self.draw_box is not None:
+            self.draw_box.hide()
+        self.state_changed()
+
+    def state_changed(self):
+        if self.recorder is not None:
+            self.recorder.mark(time.perf_counter(), self.session_flags())
+        if self.sender is not None and self.sender.last is not None:
+            # resend the last position so the receiver sees the new state
+            x, y, _ = self.sender.last
+            self.sender.post(x / 65535, y / 65535, self.session_flags())
+
+    def session_flags(self):
+        flags = FLAG_LASER if self.laser_visible else 0
+        if self.annotating:
+            flags |= FLAG_ANNOTATE
+        if self.inking:
+            flags |= FLAG_INK
+        return flags
+
+    def set_recording(self, recording):
+        if recording and self.recorder is None:
+            os.makedirs(self.sessions_dir, exist_ok=True)
+            path = os.path.join(
+                self.sessions_dir, time.strftime("%Y%m%d-%H%M%S") + SESSION_SUFFIX
+            )
+            try:
+                self.recorder = SessionRecorder(path)
+            except OSError as e:
+                log.warning("could not record session: %s", e)
+                return
+            self.recorder.mark(time.perf_counter(), self.session_flags())
+        elif not recording and self.recorder is not None:
+            self.recorder.close()
+            log.info(
+                "recorded %d positions to %s",
+                self.recorder.records,
+                self.recorder.path,
+            )
+            self.recorder = None
+
+    def last_session(self):
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(self.sessions_dir)
+                if name.endswith(SESSION_SUFFIX)
+            )
+        except OSError:
+            return None
+        if not names:
+            return None
+        return os.path.join(self.sessions_dir, names[-1])
+
+    def replay_session(self, path=None, start=0.0):
+        path = path or self.last_session()
+        if path is None or self.player is not None:
+            return
+        try:
+            reader = SessionReader(path)
+        except (OSError, ValueError) as e:
+            log.warning("could not replay %s: %s", path, e)
+            return
+        self.set_scheduler_running(False)
+        self.player = SessionPlayer(reader, start, parent=self)
+        self.player.record.connect(self.replay_record)
+        self.player.finished.connect(self.replay_finished)
+        self.player.start()
+
+    def replay_record(self, x, y, flags):
+        laser = bool(flags & FLAG_LASER)
+        if laser != self.laser_visible:
+            self.laser_visible = laser
+            self.update_laser()
+        annotating = bool(flags & FLAG_ANNOTATE)
+        if annotating != self.annotating:
+            self.set_annotating(annotating)
+        inking = bool(flags & FLAG_INK)
+        if inking != self.inking:
+            self.set_inking(inking)
+        self.move_dot(x, y)
+
+    def replay_finished(self):
+        self.player.reader.close()
+        self.player.deleteLater()
+        self.player = None
+        self.on_dot_visibility()
+
+    def export_track(self, path=None, output=None):
+        """Write the laser centre on its target screen, per recorded sample."""
+        path = path or self.last_session()
+        if path is None:
+            return None
+        output = output or os.path.splitext(path)[0] + ".csv"
+        try:
+            reader = SessionReader(path)
+        except (OSError, ValueError) as e:
+            log.warning("could not export %s: %s", path, e)
+            return None
+        try:
+            self.write_track(reader, output)
+        except (OSError, ValueError) as e:
+            log.warning("could not export %s: %s", path, e)
+            return None
+        finally:
+            reader.close()
+        return output
+
+    def write_track(self, reader, output):
+        if reader.version < 2:
+            raise ValueError("recorded without laser positions")
+        t0 = reader.chunks["t0"][0] if len(reader) else 0.0
+        screens = [(screen.name(), screen.geometry()) for screen in self.screens]
+        name, geometry = screens[0]
+        with open(output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["t", "screen", "x", "y", "laser", "annotate"])
+            for index in range(len(reader.chunks)):
+                times, _, _, states = reader.chunk(index)
+                xs, ys = reader.laser(index)
+                for t, x, y, flags in zip(
+                    times.tolist(), xs.tolist(), ys.tolist(), states.tolist()
+                ):
+                    if not geometry.contains(x, y):
+                        for name, geometry in screens:
+                            if geometry.contains(x, y):
+                                break
+                        else:
+                            continue  # on a screen that is gone
+                    writer.writerow(
+                        [
+                            "%.4f" % (t - t0),
+                            name,
+                            x - geometry.left(),
+                            y - geometry.top(),
+                            flags & FLAG_LASER,
+                            (flags & FLAG_ANNOTATE) >> 1,
+                        ]
+                    )
+
+    def update_laser(self):
+        if self.laser_visible:
+            if self.current_region is None:
+                self.current_region = self.region_index
+            self.activate_region(self.current_region)
+        else:
+            for dot in self.dots.values():
+                dot.hide()
+            self.current_region = None
+
+    def show_draw_box(self):
+        if self.draw_box is None:
+            self.draw_box = DrawBox()
+            self.draw_box.mouseup.connect(self.save_preview_pos)
+        if self.draw_box.isVisible():
+            return
+        pos = QtGui.QCursor().pos()
+        source_screen = QtGui.QGuiApplication.screenAt(pos)
+        if source_screen is None:
+            source_screen = QtGui.QGuiApplication.primaryScreen()
+        self.draw_box.setGeometry(source_screen.geometry())
+        self.draw_box.set_refresh_rate(source_screen.refreshRate())
+        self.draw_box.show()
+        self.draw_box.raise_()
+        self.draw_box.activateWindow()
+        self.draw_box.setFocus()
 
     def init_tray_icon(self):
         # tray icon
@@ -425,8 +3744,28 @@ class Master(QtWidgets.QDialog):
         # tray menu
         menu = QtWidgets.QMenu()
         restore_action = menu.addAction("Display main interface")
+        self.profile_action = menu.addAction("Record timings")
+        self.profile_action.setCheckable(True)
+        self.profile_action.setChecked(profiler.enabled)
+        self.hud_action = menu.addAction("Timing HUD")
+        self.hud_action.setCheckable(True)
+        save_timings_action = menu.addAction("Save timings")
+        self.record_action = menu.addAction("Record session")
+        self.record_action.setCheckable(True)
+        replay_action = menu.addAction("Replay last session")
+        export_action = menu.addAction("Export laser track")
+        self.calibrate_action = menu.addAction("Auto-calibrate")
+        self.calibrate_action.setCheckable(True)
+        self.calibrate_action.setChecked(self.auto_calibrate)
         quit_action = menu.addAction("Exit")
         restore_action.triggered.connect(self.show_main_window)
+        self.profile_action.toggled.connect(self.set_profiling)
+        self.hud_action.toggled.connect(self.set_hud_visible)
+        save_timings_action.triggered.connect(self.save_timings)
+        self.record_action.toggled.connect(self.set_recording)
+        replay_action.triggered.connect(lambda: self.replay_session())
+        export_action.triggered.connect(lambda: self.export_track())
+        self.calibrate_action.toggled.connect(self.set_auto_calibrate)
         quit_action.triggered.connect(QtWidgets.qApp.quit)
         self.tray_icon.setContextMenu(menu)
 
@@ -434,6 +3773,135 @@ class Master(QtWidgets.QDialog):
         self.tray_icon.activated.connect(self.on_tray_activated)
         self.tray_icon.show()
 
+    def init_control(self):
+        self.control = ControlServer(parent=self)
+        for name in ("laser", "annotate", "size", "target", "region", "points"):
+            self.control.add(name, getattr(self, "control_" + name))
+        self.control.add("show", lambda connection: self.show_main_window())
+        self.control.add("status", self.control_status)
+        self.control.listen()
+        # queued points are applied once per frame, newest first
+        self.control_timer = QtCore.QTimer(self)
+        self.control_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.control_timer.timeout.connect(self.apply_control_points)
+
+    def control_laser(self, connection, state="toggle"):
+        laser = parse_switch(state, self.laser_visible)
+        if laser != self.laser_visible:
+            self.laser_visible = laser
+            self.update_laser()
+            self.state_changed()
+
+    def control_annotate(self, connection, state="toggle"):
+        annotating = parse_switch(state, self.annotating)
+        if annotating != self.annotating:
+            self.set_annotating(annotating)
+            self.state_changed()
+
+    def control_size(self, connection, value):
+        value = float(value)
+        if not CONFIG_SCHEMA["dot_scale"][2](value):
+            raise ValueError("size %s is out of range" % value)
+        self.size_spin.setValue(value)
+
+    def control_target(self, connection, *name):
+        index = self.target_monitor_cb.findText(" ".join(name))
+        if index < 0:
+            raise ValueError("no monitor named %r" % " ".join(name))
+        self.target_monitor_cb.setCurrentIndex(index)
+
+    def control_region(self, connection, *args):
+        if len(args) == 4 and all(is_int(arg) for arg in args):
+            left, top, right, bottom = (int(arg) for arg in args)
+            region = self.regions[self.region_index]
+            region.left, region.right = min(left, right), max(left, right)
+            region.top, region.bottom = min(top, bottom), max(top, bottom)
+            self.select_region_fields()
+            self.regions_changed()
+            return
+        index = self.region_cb.findText(" ".join(args))
+        if index < 0:
+            raise ValueError("no region named %r" % " ".join(args))
+        self.region_cb.setCurrentIndex(index)
+
+    def control_points(self, connection, *values):
+        """Queue (t, x, y) triples, t in seconds on the client's clock."""
+        if not values or len(values) % 3:
+            raise ValueError("expected t x y triples")
+        values = [float(value) for value in values]
+        # points are applied later on a timer, so reject them here
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError("points must be finite numbers")
+        if not all(abs(value) < 1e6 for value in values[1::3] + values[2::3]):
+            raise ValueError("points must be on the desktop")
+        now = time.perf_counter()
+        offset = self.control_offsets.get(connection)
+        # anchor the client clock on its first batch, or after falling behind
+        if offset is None or values[0] + offset < now - 0.1:
+            offset = now - values[0]
+            if connection is not None and connection not in self.control_offsets:
+                connection.destroyed.connect(
+                    lambda _, c=connection: self.control_offsets.pop(c, None)
+                )
+            self.control_offsets[connection] = offset
+        points = self.control_queue
+        for i in range(0, len(values), 3):
+            points.append((values[i] + offset, values[i + 1], values[i + 2]))
+        if not self.control_timer.isActive():
+            self.control_timer.start(max(1, round(self.scheduler.interval * 1000)))
+            self.apply_control_points()
+
+    def apply_control_points(self):
+        points = self.control_queue
+        now = time.perf_counter()
+        latest = None
+        while points and points[0][0] <= now:
+            latest = points.popleft()
+        if latest is not None:
+            self.move_dot(latest[1], latest[2])
+        if not points:
+            self.control_timer.stop()
+
+    def control_status(self, connection):
+        return "laser=%s annotate=%s size=%s target=%s region=%s queued=%d" % (
+            "on" if self.laser_visible else "off",
+            "on" if self.annotating else "off",
+            self.size_spin.value(),
+            self.target_monitor,
+            self.regions[self.region_index].name,
+            len(self.control_queue),
+        )
+
+    def set_profiling(self, enabled):
+        profiler.enabled = enabled
+        profiler.last_frame = None
+
+    def set_hud_visible(self, visible):
+        if visible:
+            self.profile_action.setChecked(True)
+            if self.hud is None:
+                self.hud = ProfilerHud()
+            geometry = QtGui.QGuiApplication.primaryScreen().availableGeometry()
+            self.hud.move(geometry.topLeft())
+            self.hud.show()
+        elif self.hud is not None:
+            self.hud.hide()
+
+    def save_timings(self):
+        try:
+            profiler.dump(self.timings_path)
+        except OSError as e:
+            log.warning("could not write timings: %s", e)
+
+    def on_quit(self):
+        if profiler.enabled:
+            self.save_timings()
+        self.set_recording(False)
+        self.stream_mode = "off"
+        self.build_stream()
+        self.config.flush()
+        atlas_cache.flush()
+
     def show_main_window(self):
         self.showNormal()
         self.activateWindow()
@@ -452,13 +3920,23 @@ class Master(QtWidgets.QDialog):
         self.hide()
 
 
+dot_data = bytes(
+    "iVBORw0KGgoAAAANSUhEUgAAAC4AAAAuCAYAAABXuSs3AAAPIXpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHja7ZpZkiQpkobfOUUfAVBA4TisIn2DOf58illGZkZlZC3TLyPS4ZVuHhbmGOjyL1i5/T//Pu5f/CQJyaWstbRSPD+ppRY7H6p/fp5j8Om+35+437+Fn8+7jz9ETglHeX4t7/nQOZ+/f0HTe378fN7pfMep70DvH74NKHbnyIf3uvoOJPE5H97fXXu/19MPy3n/zX2H8OEd9PPvSQnGypyUyNKE87xHu4swA6nSORbeo3CaM4nPSYR3kfzr2LmPj5+C9/HpU+x8f8/Lz6FwvrwXlE8xes+H/OvY3Qj9OKPw/c4//WEmf/yPPz/E7pxVz9nP6noqRKq4d1HflnI/ceEglHK/Vngp/zKf9b4ar8oSJxlbZHPwmi60EIn2CSms0MMJ+x5nmEwxxR2VY4wzyj1XRWOLU54U8AonqjRZjhxFmWRNOB0/5hLufdu93wyVO6/AlTEwWOAbf3i5X538J6+Pgc6x0g3B149YMa9oBcg0LHP2zlUkJJw3pvnG977cD3Xjf0iskMF8w1xZYPfjGWLk8L225OZZuC775PzTGkHXOwAh4t6ZyQTQIfgSJIcSvMaoIRDHSn46M4+S4iADIee4gjvkRqSQnBrt3nxHw7025vicBlpIRKZplNQ06SQrpUz9aKrUUM+Sk8s5l6y55pZ7kZJKLqVoMYzqKpo0a1HVqk17lZpqrqVqrbXV3mITICy30tS12lrrnZt2hu58u3NF7yMOGWnkUYaOOtrok/KZaeZZps462+wrLlm0/ypL3aqrrb7DppR22nmXrbvutvuh1o6cdPIpR0897fSPrL1Z/Tlr4VPmfp+18GbNMpbudfo9a5xW/TZEMDjJljMyFlMg42oZoKCj5czXkFK0zFnOfIsGUpGshWzJWcEyRgbTDjGf8JG775n7bd5cTn8rb/GrzDlL3X8ic85S92buj3n7RdZWv4wiN0HWhRZTLwdg44Jde6zdOOmLY8/MSVvZnRiUkNeKUtQ4yd5l7eGKprRCXCOzDm29aMuUaoJxI7cqNN/RsE8efHOHw1LD4K3WnlodXO9Dq0VcC5XZa9+pjzprimBkrweMpD52oS1jb4t4n6Jx5HPLeOku5OEYnNSzezu2NNlUWyPfZ5ZBfGNdG0IeWtssYcVIVsOGYUOWFQhhLsR7jwju65oljxYL3R83sddEEHQJ77s2QCTlkOdWCD7ZL/4PxxSUNc51SzUC/mMwfO+ksPky6rLp1qQnJ/vUSNmZtY6zJa/JhFZIGuDc2HptpLlkm88RWGQWzW3ksiQxn97aVu5STlx9buhmjlESlUMdB3vXYUW8xtoU6V7x9L32dtFG9PsQaEJRN3miwjrTzuNmM60hqfVANqnahNqQ5hPZTIfQrbzbiozvIs1wctEpW05VCdQJ2ElZ6xDCTqFS2LsdEV9uWe0hzOVzqbn4dS22sroVTl4Q3d5r7EKjTSjQmiNrEsJYq8VyiaP4N8XDL3vSXL3ZXEVLG4OcF3/imHkD6jvTpyoxD+JIHUGYtA5ZOmslPxywjsyrBKLKWITSayA9jHRWG8VuSqXlYseju1FtFJps/puhSFijnHWGODmgDKlrUbuS49IHbZ1KtEiBBLOexbRYTCQTmwknmrlFVrbnnjQ/AQBl3AacoC+ERbesgXcZJEsRTSlEPwNbVpt9raOyVp2WexBnfgt3eUrU+S9r9+OYwxw+ZelgX4+pcd9Z/e6+TqvTyGVRXVk1W4biAOaoXGW9oNbZyixQU4eKY2Iaw48t+rlDW3dxUO2FugFGwJLBAgC/KSaJtgzgc4MHnJ9Ce66hK5wic/dNiDalCK/kmdTBBJwziILHqi5wiJIXegAKGmlvXAHH0/JAB4PpZe+dwMqxmKUi0VbbuxdXVcumryYQFSpKejOzQp3DPblQwyudeY6w0tLR2VQ8+WZmpY4CyfKZQqzV9afsKwvy/SbC/3QcJLe0LIDsLqeBe/005Y4nwi/zdKLFn6NrNgzMQ8hSJNv9kG1jE7Th8nsoTUsizvC5p3EK9T0nhRSGnlZE2vRbibzLEJ9fHeD2uUGcA23U6VYKKCwD98iSTgP9wL+01jRp7EdC6fQ6+StQDi0eN97Cwjek+Gdk8puj+5l1auaGEAY8x3TuRFG7ZVP6ocaZh1e6ss2VD9WNWQEDFXDK28Ebg0qNoJLU1gktpTI2GBHBcejmUGDtUDix7wYSXDCO2yiEjl6tDPDu0GsEWDMI3IYlJnEWwBS7/TzUlmoOhmy9yVnv4qkIpPm7DNIqa0yHfOgdJW/QTODWasGECn0DNpP40rquvio4AuSyaiBCSVwC2ZfQLkrY1+U12IcFnQUIMFVvzd1tLoLaIHdIiAQnKNBOdxIk5AxKgRt1Kgw0H+iOfJjRbcb99DpGY5+H1hBgf+fo/sKFKLENrVtHr3YKjK97wlSnVSpJ+0kApssg8oDFQu67DwNeerYCtRBTgvNyMgWxIExCgyNCAhBoaKkQyoJ4PGmiH7qjZEF2KJ48Uhgoqa0RqVU3dTxDtK7SsZqUPYlHPsmqYwMkkBNAayJwQBcOR2daBs0G3ZYKXSPlZpA1yVpBeQyc3iy0CZUAwEfwPHTT06xvj1SmtWE5rlCFUEwBscuRRD9CSrAu2hdnNHG63B4hFTpkCcChcYD2TD0j86afKFbeKci+55jCyqF7gcYu3IF2s+fKZcJQ0MuiukdomSJg4DEQaUxqTs8EdwQxioOLs9BchTSgQTZLx/BEcCABUNAOjYRgb3tAK+EifUbQAmfZ9OVlFSt2174lef5fep+s/fmFE1SkbCGyfamdYFz+TQHspeVBODDMtTURhpVWp5bINAkvOAWIuxrjUF0kPlqYM40RWlPI19Qm8bP3Qz5N2aKP9gQzD+3XhuIGQ6+kiOKsg29DzQNJT/ziQUNcsYFAKhdM/J0h7bmgbEKZwMrSLJMwCFYiTLAqV1IS8QBHBma0cQVFRDVWgxqqJ7JC8EJQA3uf7pQqggr+gvz8/dH5v//FbPX0aHdKCpeCvm8OVbQlmuCTerV76cvURrea8ZgiBNc8SG6MGDUjJhK0WVDPS4Q97eq7+wUn/qPjfwf6/zdQ9K7uU1akQ2hbzR45iC8dti0Gn+Ypt8E+2ite5qO18ErBsBVFgpgTmU5nE4HNqEfYuWuwLkcPpWuz8nPL0ejy3+ON+8dI9quBQNJoCwwNEzVYIEprd8gG9MrvAqvcBaphWnioXY1PKteZxXATMSsDrFcgK6xcasLlqzngALMyZjG0MxMIfeLfzAQiWf01gdgXMMga2E0DMKQBnp74opzxalyGsvE4wD0gFbDTSAspi2eCtFAutC4CrOZqzA5v49c2AhjpCu3kaN4SugUy8ZiQjXZjYdAA5o3LuCZu4xrUt2LiEFYeky+wzpzECIcRbDsV78/gmOS8TWLjiZgR/sxsORN54Ui+KCX3HyjqdyDBImLi28O0jXDOdpk2IEa8MS0YBtPiDauB4TYB31EFtj2CGvV3eyQ4AoRA+4G4Htr6RlqX32ESDD76wBzozCbpuMEAGvEoZUJTgH/GnbxS2+wlCpQcixndYHbUqnvmlxCD+csaFvQf4RuSEO7cjL4cqgcRU2dH6HfbhqHHsJcH07xaz2ZXw4DhIn4V25xMolbbNhG+MjFJXVABszkRRXdM2i/uhaBdAQdn4vaaVaYC8a6XrNDg8ytucf+MxX4kJ49BQY2YlYFC62NlWrV6xsqULmPcRVKTlGzJmHd6SVmk0oljeQQhBqJPq33NDrW+bg+ZWh8Ig6vWvTVRsm0k3OEkriHsgAzFhcj04Ff3K+HSByKjCe27nO1+DKSuCfKOvlu4DjznBKRS6rT2sH7CrVD21k60rm2R4G5xMYJ6BAbDac2hYdAItu+JgkbCq65XcnXa5jGQ9NNu7RpIM3ytmdS9wvh0pjpyKuBRa+YJNM6ByIOobUKGMsQCKU0d4wwxlAvrRZ2IPd9Ch+ZazRcmglkIzvBumFfBnSzqFbed0TO2k18MHlADiHWl+AYIsipgYJvsCJ6SqrX+luMfexkchiyxqmCAUdo0/b4OPjZdPKE6LcsprPIndeD+VuHkFM8+m2qdG29dDAdRJqL2EKrZ86aFYDzMpxDioETn2stB2Cf5KnNWE/5njtt9099NoEIwiBHOYRd1Bg8YzxUTmol10hD1MZ5HcZdCNTWc866vu5RI3Zq7DNbD2NQCEcIdbvlf2MvvbvnWRD2nUNokZaPV4FDPgPADyTn0nwnYSLCzabM5mMkqmIzeEg3cQYFlECvL2/YByUWHTiiWgixn2ionBJHollPJOF7EQ8a5ciWcgF+hswxfQL0SsUV413GhCsnY73bQKXc7aHeQYSENcX+SumuTe7fGFJkabj8YnYzrWkNigNXyoqP4h5lBqmcjD9xvSFQuAh5uQGr65GiE+O6B2QZYHs8GWLtksvenDbCvq+MnPLI9MJm0bAXeM41g8I8wJ+FnAxFZbfvLtmUgCHx9BL6BGpZJZZPPbLt3BqmoebUNQC/dvqiWMjLGKGtcs3BWtmOwbf0tN7C9BhbY1RGVYcVR4t2FQvnjQ6bs0O/24Z62NyNKJT+7hyCy7R4qlfjsHkZT3LpdsZ25GW3Lw3rQtp4D0uomzgr32WJdtkdhW6xNMeh3i9UoO5tXt7Ltxdl+QcH0TgywWfpZpqUlQGRUEVRwUAyv3IItzleE6z6fEB0prbKf/WetpaRn/zlOHOndf8ZYyF7P04ToH0eS3NDapZkjUXggmSOxbXV4Nj4PMWDpZVvnPYDpkXRQNYgegBXYbZGC3gGB5YbhaFV0U1JDLiwa1WhUbVpLsj14AJI3fierN0HafLE9TTk3g80vi/Fw9tihBZjdA8YUQl5gTCmyAdT3kYMQT+P595HDQqDZNjEqI5v80fvEwa0m6y+ZPnvsEAUgDSjBDqL2lEwxLntMPRiI1ktV7KHDfTZEFdcyzn6eN3jQHJXz7XmDTcYefxTMn8A3eh83rLBidsi9Gm37f98ti7oLV1IngAzuFSgwKrtPEiyT9lwoVRrveS7kZxr1PhdKTgkHKGLsi3ZdCcBI0EtPxSDk/u8LaFfbxL6PG+xRNq6bUnueNgDBuTKq7Yza4wZaHX5/Hze85dcxB/ur+rsbfu5/AYrKwaT+R8VCAAAABmJLR0QAAAAAAAD5Q7t/AAAACXBIWXMAAA7DAAAOwwHHb6hkAAAAB3RJTUUH4gYXEysl9sK+qAAABgVJREFUaN69WmF3ozgMHIFJs///x17BgO4DGjwopu1ubi/v+UETEo/k0ViSa3jz5cfFAAxx5b0+4wbs8fiO4++3XvYGYAMwOlDsuA4GDN4MuDwuwLcAvwJY7bT9LwMPYKMDkwHFgYJjDBwGWBgGA9ybp3cAux3gVwCrA9UOA/a/AtyP8TBgwgF4QgNN4GN43dIk7gewjcA9gMeoABY7jPjRCpQfgqaHPxx44Lifgib0+gBgxA1VIMBdPB6gqx2/MTuwANjsHeDenvlAA/3AAXpCGyUoMoa3BwvwHlSxBni3gyIEvtD4+P4IYPHj/d8HHqAnB54EHkM9/iDHGaDkudDFEVQJimSalPBy8Svd4F9Q5yuPE3QP+Ef2uLcJR3uVwz0oQjXZSJEAWhyYKaUeNwG+6/ly4+3iB8inAc+4/wiO04BJvF9cPKYet6QomduBYVFV4jJZW7H6LfCY/ARJAzqen+ygSqbLqFqepHATfi8xP3mtG5jSdfcmoX3glLwEkOOZ7h8SrCWoNXaU5QLcD82uwm1+xzoqxLjYHfhH+Z49XuhFejxdnx0jVFnKjZZvIoc1VmjE1dCefGpQr8r3olu4ePAcpIoEqoLXZydZ+qzlmwzl9rk6sUlpekD5zCq0Z48XE32O64ddKUEv/0ILWP18EjBD8l4NjldvwWgB2vxk6iGZAfIRxqqCzSfwWFYGWFGpS6vwwnlP+i5UycCZm6iCaABvaaxyPZ0Z2r7T40PwTvlKIFPy6iOBfybgRYKUS7/FhFUUZEyc3qx5m5RahQXFGhX3Itv6ZWjml7lvjfs5UJUuJ3Dd3kVBTNUmbUwnDk/3Ab6eHo8lpqbSa0WA8Ad6nM/gS+L4iuZt63h5RaPB5Nfg1Zg5d+aCIzBGSw8ksCUFyNQDLrtsUY8zbeV7JkHowuHsYZFXvs90wjgBE3/VVg2yUQwZO4Y87CqZkyjWrqCTaigtxrvh15JwQHgcApAVzODpvc5K8Icnoc8zpJJcp4aTIpuUbMXvAQ+polKqDCdVkp7S+wPugQ/WvMEcpQiFfgV1LOQPosean3SBavkX16z5Vm7KuHxvvc/5g6lQ5io8Y2JEsI1Jv63THbBUjN+WmQP+3stlc/nPX+W16Oneu7zHioblGLM+1eNFPFRlu2dg7mnkOSC5Sw8Tin6J+YJU5XcjF72aPLGSWYXbc9SRa9rWd/QN2T05iJkicRV0QHrfOzpRrtKXtFvuKn9i0BKjyvd7hmwJzy4dMAfgJZL1XYvZ9PAl8ZEK5qX0iognUDWC9Jk7BlT53d5c3RUpeK0Ju4B5FdCq5yZF8SOSqZctP1oRs3fAe1uFc141RHL03cLj8GsteBm9GjESnaGXe4RxY8pVuAqLN88T+GKN/3wvz78lXHsJnT0bNbgawKRft/pc3F5Apx5L/qwmysxiDNPeqjHgco0e42Yih/TIFFZWyZ+LBF/JRUAokCb8Y87HO8rzAj7ab9WaIYu052piA5ircHdTiwm+3GzPkOBTDe+VblvH6xn8TPBIQ5xYh9Dzkgraau3hJbXVMj0YLJo0TfZaLGvfcBPgNYH+BPCZgvdCH2t7QwMeS65eH70VF70O7EV9UgGiHj+llSVckkdVmvMq9GHwVu2h577KGl8apY83SFaGpM06xtRyeDFSNF4VRJVm/oL71e46WcH1RYoI1WjNW/Iu1yu1LsDtmiJw01nEo6TLnCljwGydXAWd04O5Rw9rnSWCeITOfteZOpMxqTEptdX7Ejlb/J37hrfd2vjxz5ydSVpwNuflSEWLbUqlNnr2TtmW5fHkux3zf1qnU/tdf3y1Y+mYpW2pLcaeC4vcQY5UTIqBC3CT1CEpxuyNMgR/eypRvjnVWv16anZ2pax1lkqH33dnQLt38h5py5EelML3Tt2C75OcA2mf8aX/cXciwV3UmgE17Y7Vbjj91nEhu1rW+uGPxG1K53BzzumxiezJ29z4fnxg+ycHtCYF8dnMTxvVbb9b0tRVdt36uyfM7xyJQxKqIhQxT8B5DuTSdhMD/p8j8S/+CeEcd8BlF337nxD+BRPHZs4zWhpMAAAAAElFTkSuQmCC",
+    encoding="utf-8",
+)
+
+
 if __name__ == "__main__":
     import sys
 
-    dot_data = bytes(
-        "iVBORw0KGgoAAAANSUhEUgAAAC4AAAAuCAYAAABXuSs3AAAPIXpUWHRSYXcgcHJvZmlsZSB0eXBlIGV4aWYAAHja7ZpZkiQpkobfOUUfAVBA4TisIn2DOf58illGZkZlZC3TLyPS4ZVuHhbmGOjyL1i5/T//Pu5f/CQJyaWstbRSPD+ppRY7H6p/fp5j8Om+35+437+Fn8+7jz9ETglHeX4t7/nQOZ+/f0HTe378fN7pfMep70DvH74NKHbnyIf3uvoOJPE5H97fXXu/19MPy3n/zX2H8OEd9PPvSQnGypyUyNKE87xHu4swA6nSORbeo3CaM4nPSYR3kfzr2LmPj5+C9/HpU+x8f8/Lz6FwvrwXlE8xes+H/OvY3Qj9OKPw/c4//WEmf/yPPz/E7pxVz9nP6noqRKq4d1HflnI/ceEglHK/Vngp/zKf9b4ar8oSJxlbZHPwmi60EIn2CSms0MMJ+x5nmEwxxR2VY4wzyj1XRWOLU54U8AonqjRZjhxFmWRNOB0/5hLufdu93wyVO6/AlTEwWOAbf3i5X538J6+Pgc6x0g3B149YMa9oBcg0LHP2zlUkJJw3pvnG977cD3Xjf0iskMF8w1xZYPfjGWLk8L225OZZuC775PzTGkHXOwAh4t6ZyQTQIfgSJIcSvMaoIRDHSn46M4+S4iADIee4gjvkRqSQnBrt3nxHw7025vicBlpIRKZplNQ06SQrpUz9aKrUUM+Sk8s5l6y55pZ7kZJKLqVoMYzqKpo0a1HVqk17lZpqrqVqrbXV3mITICy30tS12lrrnZt2hu58u3NF7yMOGWnkUYaOOtrok/KZaeZZps462+wrLlm0/ypL3aqrrb7DppR22nmXrbvutvuh1o6cdPIpR0897fSPrL1Z/Tlr4VPmfp+18GbNMpbudfo9a5xW/TZEMDjJljMyFlMg42oZoKCj5czXkFK0zFnOfIsGUpGshWzJWcEyRgbTDjGf8JG775n7bd5cTn8rb/GrzDlL3X8ic85S92buj3n7RdZWv4wiN0HWhRZTLwdg44Jde6zdOOmLY8/MSVvZnRiUkNeKUtQ4yd5l7eGKprRCXCOzDm29aMuUaoJxI7cqNN/RsE8efHOHw1LD4K3WnlodXO9Dq0VcC5XZa9+pjzprimBkrweMpD52oS1jb4t4n6Jx5HPLeOku5OEYnNSzezu2NNlUWyPfZ5ZBfGNdG0IeWtssYcVIVsOGYUOWFQhhLsR7jwju65oljxYL3R83sddEEHQJ77s2QCTlkOdWCD7ZL/4PxxSUNc51SzUC/mMwfO+ksPky6rLp1qQnJ/vUSNmZtY6zJa/JhFZIGuDc2HptpLlkm88RWGQWzW3ksiQxn97aVu5STlx9buhmjlESlUMdB3vXYUW8xtoU6V7x9L32dtFG9PsQaEJRN3miwjrTzuNmM60hqfVANqnahNqQ5hPZTIfQrbzbiozvIs1wctEpW05VCdQJ2ElZ6xDCTqFS2LsdEV9uWe0hzOVzqbn4dS22sroVTl4Q3d5r7EKjTSjQmiNrEsJYq8VyiaP4N8XDL3vSXL3ZXEVLG4OcF3/imHkD6jvTpyoxD+JIHUGYtA5ZOmslPxywjsyrBKLKWITSayA9jHRWG8VuSqXlYseju1FtFJps/puhSFijnHWGODmgDKlrUbuS49IHbZ1KtEiBBLOexbRYTCQTmwknmrlFVrbnnjQ/AQBl3AacoC+ERbesgXcZJEsRTSlEPwNbVpt9raOyVp2WexBnfgt3eUrU+S9r9+OYwxw+ZelgX4+pcd9Z/e6+TqvTyGVRXVk1W4biAOaoXGW9oNbZyixQU4eKY2Iaw48t+rlDW3dxUO2FugFGwJLBAgC/KSaJtgzgc4MHnJ9Ce66hK5wic/dNiDalCK/kmdTBBJwziILHqi5wiJIXegAKGmlvXAHH0/JAB4PpZe+dwMqxmKUi0VbbuxdXVcumryYQFSpKejOzQp3DPblQwyudeY6w0tLR2VQ8+WZmpY4CyfKZQqzV9afsKwvy/SbC/3QcJLe0LIDsLqeBe/005Y4nwi/zdKLFn6NrNgzMQ8hSJNv9kG1jE7Th8nsoTUsizvC5p3EK9T0nhRSGnlZE2vRbibzLEJ9fHeD2uUGcA23U6VYKKCwD98iSTgP9wL+01jRp7EdC6fQ6+StQDi0eN97Cwjek+Gdk8puj+5l1auaGEAY8x3TuRFG7ZVP6ocaZh1e6ss2VD9WNWQEDFXDK28Ebg0qNoJLU1gktpTI2GBHBcejmUGDtUDix7wYSXDCO2yiEjl6tDPDu0GsEWDMI3IYlJnEWwBS7/TzUlmoOhmy9yVnv4qkIpPm7DNIqa0yHfOgdJW/QTODWasGECn0DNpP40rquvio4AuSyaiBCSVwC2ZfQLkrY1+U12IcFnQUIMFVvzd1tLoLaIHdIiAQnKNBOdxIk5AxKgRt1Kgw0H+iOfJjRbcb99DpGY5+H1hBgf+fo/sKFKLENrVtHr3YKjK97wlSnVSpJ+0kApssg8oDFQu67DwNeerYCtRBTgvNyMgWxIExCgyNCAhBoaKkQyoJ4PGmiH7qjZEF2KJ48Uhgoqa0RqVU3dTxDtK7SsZqUPYlHPsmqYwMkkBNAayJwQBcOR2daBs0G3ZYKXSPlZpA1yVpBeQyc3iy0CZUAwEfwPHTT06xvj1SmtWE5rlCFUEwBscuRRD9CSrAu2hdnNHG63B4hFTpkCcChcYD2TD0j86afKFbeKci+55jCyqF7gcYu3IF2s+fKZcJQ0MuiukdomSJg4DEQaUxqTs8EdwQxioOLs9BchTSgQTZLx/BEcCABUNAOjYRgb3tAK+EifUbQAmfZ9OVlFSt2174lef5fep+s/fmFE1SkbCGyfamdYFz+TQHspeVBODDMtTURhpVWp5bINAkvOAWIuxrjUF0kPlqYM40RWlPI19Qm8bP3Qz5N2aKP9gQzD+3XhuIGQ6+kiOKsg29DzQNJT/ziQUNcsYFAKhdM/J0h7bmgbEKZwMrSLJMwCFYiTLAqV1IS8QBHBma0cQVFRDVWgxqqJ7JC8EJQA3uf7pQqggr+gvz8/dH5v//FbPX0aHdKCpeCvm8OVbQlmuCTerV76cvURrea8ZgiBNc8SG6MGDUjJhK0WVDPS4Q97eq7+wUn/qPjfwf6/zdQ9K7uU1akQ2hbzR45iC8dti0Gn+Ypt8E+2ite5qO18ErBsBVFgpgTmU5nE4HNqEfYuWuwLkcPpWuz8nPL0ejy3+ON+8dI9quBQNJoCwwNEzVYIEprd8gG9MrvAqvcBaphWnioXY1PKteZxXATMSsDrFcgK6xcasLlqzngALMyZjG0MxMIfeLfzAQiWf01gdgXMMga2E0DMKQBnp74opzxalyGsvE4wD0gFbDTSAspi2eCtFAutC4CrOZqzA5v49c2AhjpCu3kaN4SugUy8ZiQjXZjYdAA5o3LuCZu4xrUt2LiEFYeky+wzpzECIcRbDsV78/gmOS8TWLjiZgR/sxsORN54Ui+KCX3HyjqdyDBImLi28O0jXDOdpk2IEa8MS0YBtPiDauB4TYB31EFtj2CGvV3eyQ4AoRA+4G4Htr6RlqX32ESDD76wBzozCbpuMEAGvEoZUJTgH/GnbxS2+wlCpQcixndYHbUqnvmlxCD+csaFvQf4RuSEO7cjL4cqgcRU2dH6HfbhqHHsJcH07xaz2ZXw4DhIn4V25xMolbbNhG+MjFJXVABszkRRXdM2i/uhaBdAQdn4vaaVaYC8a6XrNDg8ytucf+MxX4kJ49BQY2YlYFC62NlWrV6xsqULmPcRVKTlGzJmHd6SVmk0oljeQQhBqJPq33NDrW+bg+ZWh8Ig6vWvTVRsm0k3OEkriHsgAzFhcj04Ff3K+HSByKjCe27nO1+DKSuCfKOvlu4DjznBKRS6rT2sH7CrVD21k60rm2R4G5xMYJ6BAbDac2hYdAItu+JgkbCq65XcnXa5jGQ9NNu7RpIM3ytmdS9wvh0pjpyKuBRa+YJNM6ByIOobUKGMsQCKU0d4wwxlAvrRZ2IPd9Ch+ZazRcmglkIzvBumFfBnSzqFbed0TO2k18MHlADiHWl+AYIsipgYJvsCJ6SqrX+luMfexkchiyxqmCAUdo0/b4OPjZdPKE6LcsprPIndeD+VuHkFM8+m2qdG29dDAdRJqL2EKrZ86aFYDzMpxDioETn2stB2Cf5KnNWE/5njtt9099NoEIwiBHOYRd1Bg8YzxUTmol10hD1MZ5HcZdCNTWc866vu5RI3Zq7DNbD2NQCEcIdbvlf2MvvbvnWRD2nUNokZaPV4FDPgPADyTn0nwnYSLCzabM5mMkqmIzeEg3cQYFlECvL2/YByUWHTiiWgixn2ionBJHollPJOF7EQ8a5ciWcgF+hswxfQL0SsUV413GhCsnY73bQKXc7aHeQYSENcX+SumuTe7fGFJkabj8YnYzrWkNigNXyoqP4h5lBqmcjD9xvSFQuAh5uQGr65GiE+O6B2QZYHs8GWLtksvenDbCvq+MnPLI9MJm0bAXeM41g8I8wJ+FnAxFZbfvLtmUgCHx9BL6BGpZJZZPPbLt3BqmoebUNQC/dvqiWMjLGKGtcs3BWtmOwbf0tN7C9BhbY1RGVYcVR4t2FQvnjQ6bs0O/24Z62NyNKJT+7hyCy7R4qlfjsHkZT3LpdsZ25GW3Lw3rQtp4D0uomzgr32WJdtkdhW6xNMeh3i9UoO5tXt7Ltxdl+QcH0TgywWfpZpqUlQGRUEVRwUAyv3IItzleE6z6fEB0prbKf/WetpaRn/zlOHOndf8ZYyF7P04ToH0eS3NDapZkjUXggmSOxbXV4Nj4PMWDpZVvnPYDpkXRQNYgegBXYbZGC3gGB5YbhaFV0U1JDLiwa1WhUbVpLsj14AJI3fierN0HafLE9TTk3g80vi/Fw9tihBZjdA8YUQl5gTCmyAdT3kYMQT+P595HDQqDZNjEqI5v80fvEwa0m6y+ZPnvsEAUgDSjBDqL2lEwxLntMPRiI1ktV7KHDfTZEFdcyzn6eN3jQHJXz7XmDTcYefxTMn8A3eh83rLBidsi9Gm37f98ti7oLV1IngAzuFSgwKrtPEiyT9lwoVRrveS7kZxr1PhdKTgkHKGLsi3ZdCcBI0EtPxSDk/u8LaFfbxL6PG+xRNq6bUnueNgDBuTKq7Yza4wZaHX5/Hze85dcxB/ur+rsbfu5/AYrKwaT+R8VCAAAABmJLR0QAAAAAAAD5Q7t/AAAACXBIWXMAAA7DAAAOwwHHb6hkAAAAB3RJTUUH4gYXEysl9sK+qAAABgVJREFUaN69WmF3ozgMHIFJs///x17BgO4DGjwopu1ubi/v+UETEo/k0ViSa3jz5cfFAAxx5b0+4wbs8fiO4++3XvYGYAMwOlDsuA4GDN4MuDwuwLcAvwJY7bT9LwMPYKMDkwHFgYJjDBwGWBgGA9ybp3cAux3gVwCrA9UOA/a/AtyP8TBgwgF4QgNN4GN43dIk7gewjcA9gMeoABY7jPjRCpQfgqaHPxx44Lifgib0+gBgxA1VIMBdPB6gqx2/MTuwANjsHeDenvlAA/3AAXpCGyUoMoa3BwvwHlSxBni3gyIEvtD4+P4IYPHj/d8HHqAnB54EHkM9/iDHGaDkudDFEVQJimSalPBy8Svd4F9Q5yuPE3QP+Ef2uLcJR3uVwz0oQjXZSJEAWhyYKaUeNwG+6/ly4+3iB8inAc+4/wiO04BJvF9cPKYet6QomduBYVFV4jJZW7H6LfCY/ARJAzqen+ygSqbLqFqepHATfi8xP3mtG5jSdfcmoX3glLwEkOOZ7h8SrCWoNXaU5QLcD82uwm1+xzoqxLjYHfhH+Z49XuhFejxdnx0jVFnKjZZvIoc1VmjE1dCefGpQr8r3olu4ePAcpIoEqoLXZydZ+qzlmwzl9rk6sUlpekD5zCq0Z48XE32O64ddKUEv/0ILWP18EjBD8l4NjldvwWgB2vxk6iGZAfIRxqqCzSfwWFYGWFGpS6vwwnlP+i5UycCZm6iCaABvaaxyPZ0Z2r7T40PwTvlKIFPy6iOBfybgRYKUS7/FhFUUZEyc3qx5m5RahQXFGhX3Itv6ZWjml7lvjfs5UJUuJ3Dd3kVBTNUmbUwnDk/3Ab6eHo8lpqbSa0WA8Ad6nM/gS+L4iuZt63h5RaPB5Nfg1Zg5d+aCIzBGSw8ksCUFyNQDLrtsUY8zbeV7JkHowuHsYZFXvs90wjgBE3/VVg2yUQwZO4Y87CqZkyjWrqCTaigtxrvh15JwQHgcApAVzODpvc5K8Icnoc8zpJJcp4aTIpuUbMXvAQ+polKqDCdVkp7S+wPugQ/WvMEcpQiFfgV1LOQPosean3SBavkX16z5Vm7KuHxvvc/5g6lQ5io8Y2JEsI1Jv63THbBUjN+WmQP+3stlc/nPX+W16Oneu7zHioblGLM+1eNFPFRlu2dg7mnkOSC5Sw8Tin6J+YJU5XcjF72aPLGSWYXbc9SRa9rWd/QN2T05iJkicRV0QHrfOzpRrtKXtFvuKn9i0BKjyvd7hmwJzy4dMAfgJZL1XYvZ9PAl8ZEK5qX0iognUDWC9Jk7BlT53d5c3RUpeK0Ju4B5FdCq5yZF8SOSqZctP1oRs3fAe1uFc141RHL03cLj8GsteBm9GjESnaGXe4RxY8pVuAqLN88T+GKN/3wvz78lXHsJnT0bNbgawKRft/pc3F5Apx5L/qwmysxiDNPeqjHgco0e42Yih/TIFFZWyZ+LBF/JRUAokCb8Y87HO8rzAj7ab9WaIYu052piA5ircHdTiwm+3GzPkOBTDe+VblvH6xn8TPBIQ5xYh9Dzkgraau3hJbXVMj0YLJo0TfZaLGvfcBPgNYH+BPCZgvdCH2t7QwMeS65eH70VF70O7EV9UgGiHj+llSVckkdVmvMq9GHwVu2h577KGl8apY83SFaGpM06xtRyeDFSNF4VRJVm/oL71e46WcH1RYoI1WjNW/Iu1yu1LsDtmiJw01nEo6TLnCljwGydXAWd04O5Rw9rnSWCeITOfteZOpMxqTEptdX7Ejlb/J37hrfd2vjxz5ydSVpwNuflSEWLbUqlNnr2TtmW5fHkux3zf1qnU/tdf3y1Y+mYpW2pLcaeC4vcQY5UTIqBC3CT1CEpxuyNMgR/eypRvjnVWv16anZ2pax1lkqH33dnQLt38h5py5EelML3Tt2C75OcA2mf8aX/cXciwV3UmgE17Y7Vbjj91nEhu1rW+uGPxG1K53BzzumxiezJ29z4fnxg+ycHtCYF8dnMTxvVbb9b0tRVdt36uyfM7xyJQxKqIhQxT8B5DuTSdhMD/p8j8S/+CeEcd8BlF337nxD+BRPHZs4zWhpMAAAAAElFTkSuQmCC",
-        encoding="utf-8",
-    )
+    logging.basicConfig(level=logging.INFO)
     app = QtWidgets.QApplication(sys.argv)
+    startup.mark("qt")
+    # hand off to an instance that is already running
+    reply = send_command(" ".join(sys.argv[1:]) or "show", timeout=5000)
+    if reply is not None:
+        if len(sys.argv) > 1 or not reply.startswith("ok"):
+            print(reply)
+        sys.exit(0 if reply.startswith("ok") else 1)
     gui = Master()
     sys.exit(app.exec_())
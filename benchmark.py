@@ -0,0 +1,1126 @@
+"""Headless benchmarks for the MouseFollow hot paths.
+
+Runs on the offscreen Qt platform with pynput's dummy backend, so no display
+or input devices are needed:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json
+
+With --baseline the timings are compared against a stored run and the exit
+status is 1 if any of them regressed by more than --threshold. Behavioural
+checks (idle wakeups, dropped hotkeys, ...) fail the run the same way.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+# keep the benchmark away from the user's real settings.ini and from the
+# control socket of a running instance
+BENCH_HOME = tempfile.mkdtemp(prefix="mousefollow-bench-")
+os.environ["HOME"] = BENCH_HOME
+os.environ["MOUSEFOLLOW_CONTROL"] = "mousefollow-bench-%d" % os.getpid()
+
+from PyQt5 import QtCore, QtGui, QtWidgets  # noqa: E402
+
+import MouseFollow  # noqa: E402
+
+STARTUP_SCRIPT = """
+import sys, time
+from PyQt5 import QtCore, QtWidgets
+import MouseFollow
+
+class FirstPaint(QtCore.QObject):
+    def eventFilter(self, obj, event):
+        if obj is gui and event.type() == QtCore.QEvent.Paint:
+            print(time.time(), flush=True)
+            app.quit()
+        return False
+
+app = QtWidgets.QApplication(sys.argv)
+gui = MouseFollow.Master()
+first_paint = FirstPaint()
+gui.installEventFilter(first_paint)
+app.exec_()
+"""
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+    "5k": (5120, 2880),
+}
+
+
+failures = []
+
+
+def expect(condition, message):
+    """Record a failed check; the run exits with status 1 if any failed."""
+    if not condition:
+        failures.append(message)
+
+
+class WakeupCounter(QtCore.QObject):
+    """Counts timer, queued-call and socket events handled on the GUI thread."""
+
+    KINDS = (QtCore.QEvent.Timer, QtCore.QEvent.MetaCall, QtCore.QEvent.SockAct)
+
+    def __init__(self, app):
+        super().__init__()
+        self.count = 0
+        self.app = app
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.KINDS:
+            self.count += 1
+        return False
+
+    def measure(self, seconds):
+        self.count = 0
+        pump(self.app, seconds)
+        return self.count / seconds
+
+    def close(self):
+        self.app.removeEventFilter(self)
+
+
+def pump(app, seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def lissajous(t):
+    import numpy as np
+
+    return (
+        960 + 800 * np.sin(2 * math.pi * 0.21 * t),
+        540 + 450 * np.sin(2 * math.pi * 0.13 * t + 0.7),
+    )
+
+
+def synthetic_trace(count, rate=120.0, noise=0.0, seed=1):
+    """A Lissajous sweep over a 1920x1080 preview, as (t, x, y) tuples."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(count) / rate
+    x, y = lissajous(t)
+    if noise:
+        x = x + rng.normal(0, noise, count)
+        y = y + rng.normal(0, noise, count)
+    return t, x, y
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_startup(runs=3):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        # wall clock, the child reports when its dialog is first painted
+        start = time.time()
+        child = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            env=env,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        samples.append(float(child.stdout.split()[-1]) - start)
+    return {"startup_ms": min(samples) * 1000}
+
+
+def bench_move_dot(app, gui, count=20000):
+    t, x, y = synthetic_trace(count)
+    points = list(zip(x.astype(int).tolist(), y.astype(int).tolist()))
+    gui.laser_visible = True
+    gui.update_laser()
+    pump(app, 0.05)
+    gui.scheduler.stop()  # drive move_dot directly
+
+    start = time.perf_counter()
+    for px, py in points:
+        gui.move_dot(px, py)
+    per_call = (time.perf_counter() - start) / count
+
+    transform = gui.plans[0][0][1]
+    start = time.perf_counter()
+    for px, py in points:
+        transform.map(px, py)
+    per_map = (time.perf_counter() - start) / count
+
+    import numpy as np
+
+    array = np.column_stack([x, y])
+    per_batch_point = timed(lambda: transform.map_array(array), 20) / count
+
+    gui.laser_visible = False
+    gui.update_laser()
+    return {
+        "move_dot_us": per_call * 1e6,
+        "transform_map_us": per_map * 1e6,
+        "transform_map_array_us": per_batch_point * 1e6,
+    }
+
+
+def bench_scheduler(app, gui, seconds=1.0):
+    """Idle wakeups of the frame path and delivered cadence under load."""
+    frames = []
+    gui.scheduler.frame.connect(lambda x, y: frames.append(time.perf_counter()))
+    wakeups = WakeupCounter(app)
+
+    # laser hidden: nothing may run
+    pump(app, 0.05)
+    hidden = wakeups.measure(seconds)
+
+    # laser shown, cursor still: Qt polling wakes every frame, a push
+    # source (here a replay that has ended) does not
+    gui.laser_visible = True
+    gui.update_laser()
+    pump(app, 0.05)
+    del frames[:]
+    still_poll = wakeups.measure(seconds)
+    still_frames = len(frames) / seconds
+    gui.scheduler.set_source(MouseFollow.ReplaySource([(0.0, 500, 400)]))
+    pump(app, 0.05)
+    still_push = wakeups.measure(seconds)
+
+    # a 1 kHz replayed trace is coalesced down to the display rate
+    t, x, y = synthetic_trace(int(seconds * 1000), rate=1000.0)
+    trace = list(zip(t.tolist(), x.astype(int).tolist(), y.astype(int).tolist()))
+    gui.scheduler.set_source(MouseFollow.ReplaySource(trace))
+    del frames[:]
+    moving_wakeups = wakeups.measure(seconds)
+    moving = len(frames) / seconds
+    gui.scheduler.set_source(MouseFollow.QtPollSource())
+
+    gui.laser_visible = False
+    gui.update_laser()
+    pump(app, 0.05)
+    wakeups.close()
+
+    # a layout change while hidden must not leave a stale wakeup behind
+    gui.invalidate_transform()
+    pump(app, 0.05)
+    gui.laser_visible = True
+    gui.update_laser()
+    pump(app, 0.05)
+    del frames[:]
+    for i in range(20):
+        gui.scheduler.post(300 + i * 10, 300)
+        pump(app, 0.02)
+    after_hidden_change = len(frames)
+    gui.laser_visible = False
+    gui.update_laser()
+    pump(app, 0.05)
+
+    expect(hidden == 0, "scheduler: %.1f wakeups/s with the laser hidden" % hidden)
+    expect(still_frames == 0, "scheduler: frames emitted for a still cursor")
+    expect(
+        still_push <= 1,
+        "scheduler: %.1f wakeups/s for a still push source" % still_push,
+    )
+    expect(
+        moving <= gui.scheduler.refresh_rate * 1.1,
+        "scheduler: %.1f frames/s exceed the refresh rate" % moving,
+    )
+    expect(
+        after_hidden_change >= 20,
+        "scheduler: %d of 20 moves drawn after a change while hidden"
+        % after_hidden_change,
+    )
+    return {
+        "hidden_wakeups_per_s": hidden,
+        "still_poll_wakeups_per_s": still_poll,
+        "still_push_wakeups_per_s": still_push,
+        "still_frames_per_s": still_frames,
+        "replay_1khz_wakeups_per_s": moving_wakeups,
+        "replay_1khz_frames_per_s": moving,
+        "refresh_rate_hz": gui.scheduler.refresh_rate,
+    }
+
+
+def bench_filters(rate=120.0, count=6000, latency=0.008):
+    """Error, lag and jitter of each smoothing filter on a noisy trace.
+
+    The output at t is shown at t + latency, so it is compared against the
+    true position then; `lead` is meant to make up for that delay.
+    """
+    import numpy as np
+
+    t, x, y = synthetic_trace(count, rate=rate, noise=1.5)
+    true_x, true_y = lissajous(t + latency)
+    vx = np.gradient(true_x, t)
+    vy = np.gradient(true_y, t)
+    results = {}
+    for name, cls in MouseFollow.SMOOTHING_FILTERS.items():
+        for lead in (0.0, latency):
+            out = np.empty((count, 2))
+            if cls is None:
+                if lead:
+                    continue  # raw input has no lead
+                out[:, 0], out[:, 1] = x, y
+                per_sample = 0.0
+                key = name
+            else:
+                smoother = cls(lead=lead)
+                start = time.perf_counter()
+                for i in range(count):
+                    out[i] = smoother(t[i], x[i], y[i])
+                per_sample = (time.perf_counter() - start) / count
+                key = "%s_lead%d" % (name, round(lead * 1000))
+
+            # lag: how far along the true velocity the output trails the truth
+            ex = out[:, 0] - true_x
+            ey = out[:, 1] - true_y
+            lag = -np.mean(ex * vx + ey * vy) / np.mean(vx * vx + vy * vy)
+            jitter = np.std(np.hypot(np.diff(out[:, 0], 2), np.diff(out[:, 1], 2)))
+            results[key + "_error_px"] = float(np.mean(np.hypot(ex, ey)))
+            results[key + "_lag_ms"] = float(lag * 1000)
+            results[key + "_jitter_px"] = float(jitter)
+            if cls is not None:
+                results[key + "_sample_us"] = per_sample * 1e6
+    for name, cls in MouseFollow.SMOOTHING_FILTERS.items():
+        key = "%s_lead%d_error_px" % (name, round(latency * 1000))
+        expect(
+            cls is None or results[key] < results["none_error_px"],
+            "filters: %s with lead is further off than the raw input" % name,
+        )
+    results["display_latency_ms"] = latency * 1000
+    return results
+
+
+def legacy_rebuild(widget, scale):
+    """What RedDot.initUI did on every size change before the pixmap cache."""
+    for child in widget.findChildren(QtWidgets.QLabel):
+        child.deleteLater()
+    label = QtWidgets.QLabel(widget)
+    ba = QtCore.QByteArray.fromBase64(MouseFollow.dot_data)
+    pixmap = QtGui.QPixmap()
+    pixmap.loadFromData(ba, "PNG")
+    pixmap = pixmap.scaled(
+        int(pixmap.width() * scale),
+        int(pixmap.height() * scale),
+        QtCore.Qt.KeepAspectRatio,
+        QtCore.Qt.SmoothTransformation,
+    )
+    label.setPixmap(pixmap)
+    widget.resize(pixmap.width(), pixmap.height())
+    widget.setWindowFlags(
+        QtCore.Qt.FramelessWindowHint
+        | QtCore.Qt.WindowStaysOnTopHint
+        | QtCore.Qt.Tool
+        | QtCore.Qt.WindowTransparentForInput
+    )
+    widget.show()
+
+
+def bench_scale_factor(app):
+    scales = [round(0.5 + 0.1 * i, 1) for i in range(46)]
+    dot = MouseFollow.RedDot()
+    dot.show()
+
+    MouseFollow.pixmap_cache.scaled.clear()
+    start = time.perf_counter()
+    for scale in scales:
+        dot.set_scale_factor(scale)
+        app.processEvents()
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for scale in reversed(scales):
+        dot.set_scale_factor(scale)
+        app.processEvents()
+    warm = time.perf_counter() - start
+    dot.hide()
+
+    legacy = QtWidgets.QWidget()
+    start = time.perf_counter()
+    for scale in scales:
+        legacy_rebuild(legacy, scale)
+        app.processEvents()
+    old = time.perf_counter() - start
+    legacy.hide()
+
+    return {
+        "sweep_cached_cold_ms": cold * 1000,
+        "sweep_cached_warm_ms": warm * 1000,
+        "sweep_legacy_ms": old * 1000,
+    }
+
+
+class CountingDrawBox(MouseFollow.DrawBox):
+    """A DrawBox that records its paint events and the area they cover."""
+
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+        self.painted = 0
+        self.paint_time = 0.0
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        super().paintEvent(event)
+        self.paint_time += time.perf_counter() - started
+        self.paints += 1
+        self.painted += sum(r.width() * r.height() for r in event.region().rects())
+
+
+def mouse_event(kind, x, y, buttons=QtCore.Qt.LeftButton):
+    button = QtCore.Qt.LeftButton if kind != QtCore.QEvent.MouseMove else 0
+    return QtGui.QMouseEvent(
+        kind,
+        QtCore.QPointF(x, y),
+        QtCore.Qt.MouseButton(button),
+        QtCore.Qt.MouseButtons(buttons),
+        QtCore.Qt.NoModifier,
+    )
+
+
+def bench_drawbox(app, moves=500, rate=1000.0):
+    """Drag with a 1 kHz mouse; repaints must be coalesced to one per frame."""
+    results = {}
+    for name, (width, height) in RESOLUTIONS.items():
+        box = CountingDrawBox()
+        box.setGeometry(0, 0, width, height)
+        box.show()
+        pump(app, 0.05)
+
+        x0, y0 = width // 10, height // 10
+        QtWidgets.QApplication.sendEvent(
+            box, mouse_event(QtCore.QEvent.MouseButtonPress, x0, y0)
+        )
+        pump(app, 0.02)
+        box.paints = box.painted = 0
+        box.paint_time = 0.0
+        started = time.perf_counter()
+        for i in range(moves):
+            while time.perf_counter() < started + i / rate:
+                app.processEvents()
+            QtWidgets.QApplication.sendEvent(
+                box,
+                mouse_event(QtCore.QEvent.MouseMove, x0 + i * 3, y0 + i * 2),
+            )
+        pump(app, 0.05)
+        elapsed = time.perf_counter() - started
+        paints = max(box.paints, 1)
+        frames = elapsed * 60
+        expect(
+            box.paints <= frames * 1.1 + 2,
+            "drawbox %s: %d paints for %.0f frames" % (name, box.paints, frames),
+        )
+        results[name + "_paints_per_s"] = box.paints / elapsed
+        results[name + "_moves_per_paint"] = moves / paints
+        results[name + "_damage_paint_ms"] = box.paint_time / paints * 1000
+        results[name + "_damage_pixels"] = box.painted / paints
+
+        box.paint_time = 0.0
+        for i in range(20):
+            box.repaint()
+        results[name + "_full_paint_ms"] = box.paint_time / 20 * 1000
+        results[name + "_full_pixels"] = width * height
+        expect(
+            results[name + "_damage_pixels"] < width * height / 10,
+            "drawbox %s: damaged area is not limited to the outline" % name,
+        )
+
+        QtWidgets.QApplication.sendEvent(
+            box,
+            mouse_event(QtCore.QEvent.MouseButtonRelease, x0, y0, QtCore.Qt.NoButton),
+        )
+        box.deleteLater()
+        pump(app, 0.02)
+    return results
+
+
+def bench_settings(gui, repeat=200):
+    text = gui.config.serialize()
+    targets = [region.targets for region in gui.regions]
+    results = {
+        "save_ini_ms": timed(gui.save_ini, repeat) * 1000,
+        "load_ini_ms": timed(gui.load_ini, repeat) * 1000,
+        "config_parse_ms": timed(gui.config.load, repeat) * 1000,
+        "config_write_ms": timed(lambda: gui.config.write(text), repeat) * 1000,
+    }
+    expect(
+        [region.targets for region in gui.regions] == targets,
+        "settings: region targets changed on a save/reload",
+    )
+    # offscreen and some virtual screens have no name
+    regions = [
+        MouseFollow.Region("a", 0, 0, 10, 10, [""]),
+        MouseFollow.Region("b", 0, 0, 10, 10, ["", "HDMI-1"]),
+    ]
+    parsed = MouseFollow.parse_regions(MouseFollow.format_regions(regions))
+    expect(
+        [region.targets for region in parsed] == [[""], ["", "HDMI-1"]],
+        "settings: unnamed target screens are lost on a save/reload",
+    )
+    return results
+
+
+def bench_regions(app, gui, count=20000, regions=8):
+    """Region lookup and the batched per-frame pass with mirrored targets."""
+    saved = gui.regions
+    target = gui.target_monitor
+    gui.regions = [
+        MouseFollow.Region("r%d" % i, i * 240, 0, i * 240 + 200, 1080, [target])
+        for i in range(regions)
+    ]
+    gui.regions_changed()
+    t, x, y = synthetic_trace(count)
+    points = list(zip(x.astype(int).tolist(), y.astype(int).tolist()))
+
+    lookup = gui.region_lookup.lookup
+    start = time.perf_counter()
+    for px, py in points:
+        lookup(px, py)
+    per_lookup = (time.perf_counter() - start) / count
+
+    gui.laser_visible = True
+    gui.update_laser()
+    gui.scheduler.stop()
+    start = time.perf_counter()
+    for px, py in points:
+        gui.move_dot(px, py)
+    per_frame = (time.perf_counter() - start) / count
+
+    gui.laser_visible = False
+    gui.update_laser()
+    gui.regions = saved
+    gui.regions_changed()
+    return {
+        "region_lookup_us": per_lookup * 1e6,
+        "move_dot_%d_regions_us" % regions: per_frame * 1e6,
+    }
+
+
+def bench_hotkeys(app, gui, presses=500):
+    """Hotkey latency, plus checks that no press is lost or doubled."""
+    from pynput import keyboard
+
+    hotkeys = gui.hotkeys
+    key = keyboard.Key.alt_r
+    events = []
+    handled = []
+
+    def on_triggered(action, pressed, stamp):
+        events.append((action, pressed))
+        handled.append(time.perf_counter() - stamp)
+
+    hotkeys.triggered.connect(on_triggered, QtCore.Qt.QueuedConnection)
+    debounce = hotkeys.debounce
+
+    # every press is delivered, in order, while presses are spaced out
+    hotkeys.debounce = 0
+    for _ in range(presses):
+        hotkeys.on_press(key)
+        hotkeys.on_release(key)
+        app.processEvents()
+    pump(app, 0.05)
+    expect(
+        events == [("laser", True), ("laser", False)] * presses,
+        "hotkeys: %d of %d events handled" % (len(events), 2 * presses),
+    )
+    handled.sort()
+    latency = {
+        "hotkey_events_handled": len(handled),
+        "hotkey_events_sent": 2 * presses,
+        "hotkey_latency_p50_ms": handled[len(handled) // 2] * 1000,
+        "hotkey_latency_p99_ms": handled[int(len(handled) * 0.99)] * 1000,
+    }
+    hotkeys.debounce = debounce
+
+    # press and release within one frame still toggles the laser once
+    visible = gui.laser_visible
+    del events[:]
+    hotkeys.last_press.clear()
+    hotkeys.on_press(key)
+    hotkeys.on_release(key)
+    pump(app, 0.02)
+    expect(
+        events == [("laser", True), ("laser", False)],
+        "hotkeys: press and release in one frame gave %r" % events,
+    )
+    expect(gui.laser_visible != visible, "hotkeys: quick tap did not toggle")
+
+    # auto-repeat while held is swallowed
+    del events[:]
+    hotkeys.last_press.clear()
+    for _ in range(10):
+        hotkeys.on_press(key)
+    hotkeys.on_release(key)
+    pump(app, 0.02)
+    expect(
+        events == [("laser", True), ("laser", False)],
+        "hotkeys: auto-repeat gave %d events" % len(events),
+    )
+
+    # a second press within the debounce time is dropped
+    del events[:]
+    hotkeys.last_press.clear()
+    for _ in range(2):
+        hotkeys.on_press(key)
+        hotkeys.on_release(key)
+    pump(app, 0.02)
+    expect(
+        [pressed for _, pressed in events] == [True, False, False],
+        "hotkeys: bounce within %.0f ms gave %r" % (debounce * 1000, events),
+    )
+
+    hotkeys.triggered.disconnect(on_triggered)
+    gui.laser_visible = False
+    gui.update_laser()
+    pump(app, 0.05)
+
+    # nothing ticks while idle, hotkeys are pushed by the listener; write
+    # out pending settings first, their debounce timer fires only once
+    gui.config.flush()
+    wakeups = WakeupCounter(app)
+    idle = wakeups.measure(0.5)
+    wakeups.close()
+    active = [timer for timer in gui.findChildren(QtCore.QTimer) if timer.isActive()]
+    expect(idle == 0, "hotkeys: %.1f wakeups/s while idle" % idle)
+    expect(not active, "hotkeys: %d timers active while idle" % len(active))
+    latency["idle_wakeups_per_s"] = idle
+    return latency
+
+
+def bench_ink(app, strokes=10000, points=50, size=(1920, 1080)):
+    """Draw many short strokes; memory and repaint cost must stay flat."""
+    import tracemalloc
+
+    overlay = MouseFollow.InkOverlay()
+    overlay.setGeometry(0, 0, *size)
+    overlay.show()
+    pump(app, 0.05)
+
+    def draw(first, count):
+        for stroke in range(first, first + count):
+            x0 = (stroke * 37) % (size[0] - 200)
+            y0 = (stroke * 53) % (size[1] - 200)
+            for i in range(points):
+                angle = i * 0.2
+                overlay.add_point(
+                    x0 + i * 3 + 10 * math.cos(angle), y0 + 40 * math.sin(angle)
+                )
+            overlay.end_stroke()
+            if stroke % 100 == 0:
+                app.processEvents()
+
+    started = time.perf_counter()
+    draw(0, strokes)
+    elapsed = time.perf_counter() - started
+    # tracing is slow, so sample the Python heap over a shorter extra run
+    tracemalloc.start()
+    draw(strokes, strokes // 10)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # repaint cost with a full layer: one damaged segment vs the whole screen
+    rect = QtCore.QRect(500, 500, 16, 16)
+    started = time.perf_counter()
+    for _ in range(200):
+        overlay.repaint(rect)
+    segment = (time.perf_counter() - started) / 200
+    started = time.perf_counter()
+    for _ in range(20):
+        overlay.repaint()
+    full = (time.perf_counter() - started) / 20
+    overlay.hide()
+    layer_bytes = overlay.layer.toImage().sizeInBytes()
+    return {
+        "ink_point_us": elapsed / (strokes * points) * 1e6,
+        "ink_strokes": strokes,
+        "ink_python_peak_kb": peak / 1024,
+        "ink_layer_kb": layer_bytes / 1024,
+        "ink_segment_repaint_ms": segment * 1000,
+        "ink_full_repaint_ms": full * 1000,
+    }
+
+
+def bench_session(app, gui, seconds=3600, rate=120.0, replayed=20000):
+    """Record an hour at 120 Hz, then seek, decode, replay and export it."""
+    count = int(seconds * rate)
+    t, x, y = synthetic_trace(count, rate)
+    t = t.tolist()
+    x = x.astype(int).tolist()
+    y = y.astype(int).tolist()
+    path = os.path.join(os.environ["HOME"], "bench" + MouseFollow.SESSION_SUFFIX)
+
+    # the laser on a target at a third of the preview size
+    laser = [(px // 3, py // 3) for px, py in zip(x, y)]
+
+    recorder = MouseFollow.SessionRecorder(path)
+    start = time.perf_counter()
+    for i in range(count):
+        recorder.append(t[i], x[i], y[i], MouseFollow.FLAG_LASER, laser[i])
+    per_append = (time.perf_counter() - start) / count
+    recorder.close()
+
+    open_time = timed(lambda: MouseFollow.SessionReader(path).close(), 20)
+    reader = MouseFollow.SessionReader(path)
+    assert len(reader) == count
+    targets = [seconds * i / 100 for i in range(100)]
+    start = time.perf_counter()
+    for target in targets:
+        reader.seek(target)
+    per_seek = (time.perf_counter() - start) / len(targets)
+    start = time.perf_counter()
+    for record in reader.records():
+        pass
+    per_decode = (time.perf_counter() - start) / count
+
+    gui.laser_visible = True
+    gui.update_laser()
+    pump(app, 0.05)
+    gui.scheduler.stop()  # drive move_dot directly
+    start = time.perf_counter()
+    for i, (_, px, py, _) in enumerate(reader.records()):
+        if i == replayed:
+            break
+        gui.move_dot(px, py)
+    per_replay = (time.perf_counter() - start) / replayed
+    gui.laser_visible = False
+    gui.update_laser()
+    reader.close()
+
+    start = time.perf_counter()
+    os.remove(gui.export_track(path))
+    per_export = (time.perf_counter() - start) / count
+    size = os.path.getsize(path)
+    os.remove(path)
+    return {
+        "session_records": count,
+        "session_bytes_per_record": size / count,
+        "session_file_mb": size / 2**20,
+        "session_append_us": per_append * 1e6,
+        "session_open_ms": open_time * 1000,
+        "session_seek_us": per_seek * 1e6,
+        "session_decode_us": per_decode * 1e6,
+        "session_replay_us": per_replay * 1e6,
+        "session_export_us": per_export * 1e6,
+    }
+
+
+def synthetic_slide(width, height, seed):
+    """A QImage of random blocks and text, standing in for a slide."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor("white"))
+    painter = QtGui.QPainter(image)
+    for _ in range(60):
+        color = QtGui.QColor(*(int(value) for value in rng.integers(0, 256, 3)))
+        left, top = rng.integers(0, width), rng.integers(0, height)
+        w, h = rng.integers(width // 40, width // 4), rng.integers(
+            height // 40, height // 4
+        )
+        painter.fillRect(int(left), int(top), int(w), int(h), color)
+    font = painter.font()
+    font.setPixelSize(height // 20)
+    painter.setFont(font)
+    for line in range(8):
+        painter.drawText(width // 10, height // 8 * (line + 1), "Slide line %d" % line)
+    painter.end()
+    return image
+
+
+def bench_calibration(app):
+    """Find a known preview rectangle in synthetic presenter screenshots."""
+    results = {}
+    for name, (width, height) in RESOLUTIONS.items():
+        target = synthetic_slide(width, height, 1)
+        source = synthetic_slide(width, height, 2)
+        # a presenter console: the slide preview at about half size
+        rect = (width // 13, height // 7, width * 15 // 32, height * 15 // 32)
+        painter = QtGui.QPainter(source)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.drawImage(QtCore.QRect(*rect), target)
+        painter.end()
+
+        started = time.perf_counter()
+        found = MouseFollow.find_preview(
+            MouseFollow.gray_array(source), MouseFollow.gray_array(target)
+        )
+        elapsed = time.perf_counter() - started
+        error = max(abs(a - b) for a, b in zip(found[:4], rect))
+        hint_time = timed(
+            lambda: MouseFollow.find_preview(
+                MouseFollow.gray_array(source),
+                MouseFollow.gray_array(target),
+                hint=found[:4],
+            ),
+            3,
+        )
+        results["calibrate_%s_ms" % name] = elapsed * 1000
+        results["calibrate_recheck_%s_ms" % name] = hint_time * 1000
+        results["calibrate_%s_error_px" % name] = error
+        results["calibrate_%s_score" % name] = found[4]
+    return results
+
+
+class LossySender(MouseFollow.StreamSender):
+    """Drops a fraction of outgoing packets, standing in for a bad network."""
+
+    def __init__(self, host, port, loss, seed=1, heartbeat=None):
+        import random
+
+        super().__init__(host, port, heartbeat)
+        self.loss = loss
+        self.random = random.Random(seed)
+
+    def send(self, packet):
+        if self.random.random() >= self.loss:
+            super().send(packet)
+
+
+def bench_stream(updates=1000, burst=5000, rate=5000.0, port=47475):
+    """Loopback sender to receiver: latency, CPU cost and loss tolerance."""
+    import threading
+
+    arrived = threading.Event()
+    positions = []
+
+    def sink(x, y):
+        positions.append((x, y))
+        arrived.set()
+
+    receiver = MouseFollow.StreamReceiver(port, bind="127.0.0.1")
+    receiver.start(sink)
+    sender = MouseFollow.StreamSender("127.0.0.1", port)
+    latencies = []
+    cpu = time.process_time()
+    for i in range(updates):
+        arrived.clear()
+        started = time.perf_counter()
+        # alternate small and large moves: deltas and key packets
+        step = 50 if i % 2 else 5000
+        sender.post((i * step % 65536) / 65535, 0.5, 1)
+        arrived.wait(1.0)
+        latencies.append(time.perf_counter() - started)
+    cpu = time.process_time() - cpu
+    sender.close()
+    latencies.sort()
+    results = {
+        "stream_latency_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "stream_latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "stream_cpu_per_1000_ms": cpu / updates * 1000 * 1000,
+    }
+
+    t, x, y = synthetic_trace(burst)
+    for loss in (0.0, 0.05, 0.2):
+        sender = LossySender("127.0.0.1", port, loss)
+        receiver.received = receiver.applied = 0
+        started = time.perf_counter()
+        for i in range(burst):
+            while time.perf_counter() < started + i / rate:
+                pass
+            sender.send(sender.encode(x[i] / 1920, y[i] / 1080, 1))
+        time.sleep(0.1)
+        sender.close()
+        name = "loss%d" % round(loss * 100)
+        # lost packets plus the deltas that depended on them
+        results["stream_%s_received_fraction" % name] = receiver.received / burst
+        results["stream_%s_applied_fraction" % name] = receiver.applied / burst
+
+    # a lost toggle or delta is repaired by the idle heartbeat
+    flags = []
+    receiver.on_flags = flags.append
+    sender = LossySender("127.0.0.1", port, 0.0, heartbeat=0.2)
+    arrived.clear()
+    sender.post(0.25, 0.5, 1)
+    arrived.wait(1.0)
+    recovered = {}
+    for name, sample in (("toggle", (0.25, 0.5, 0)), ("delta", (0.2505, 0.5, 0))):
+        sender.loss = 1.0
+        sender.post(*sample)
+        time.sleep(0.05)
+        sender.loss = 0.0
+        x = min(max(int(sample[0] * 65535 + 0.5), 0), 65535)
+        started = time.perf_counter()
+        while time.perf_counter() - started < 1.0:
+            if flags[-1:] == [sample[2]] and positions[-1][0] == x:
+                recovered[name] = time.perf_counter() - started
+                break
+            time.sleep(0.005)
+        expect(name in recovered, "stream: a lost %s was never recovered" % name)
+        results["stream_lost_%s_recovery_ms" % name] = (
+            recovered.get(name, float("nan")) * 1000
+        )
+    sender.close()
+    receiver.close()
+    results["stream_key_bytes"] = struct.calcsize(MouseFollow.STREAM_KEY_PACKET)
+    results["stream_delta_bytes"] = struct.calcsize(MouseFollow.STREAM_DELTA_PACKET)
+    return results
+
+
+def bench_control(app, gui, batches=100, batch=10, spacing=0.001, pings=200):
+    """Drive the laser through the control socket at 1000 points per second."""
+    import socket
+    import threading
+
+    if not gui.control.server.isListening():
+        expect(False, "control: socket %s not listening" % gui.control.name)
+        return {}
+    path = gui.control.server.fullServerName()
+    latencies = []
+    errors = []
+
+    def client():
+        try:
+            drive()
+        except OSError as e:
+            errors.append(e)
+
+    def drive():
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+        stream = connection.makefile("rw")
+        for _ in range(pings):
+            started = time.perf_counter()
+            stream.write("status\n")
+            stream.flush()
+            if not stream.readline():
+                raise ConnectionResetError("control socket closed")
+            latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for n in range(batches):
+            values = []
+            for i in range(batch):
+                t = (n * batch + i) * spacing
+                values.append("%.4f %d %d" % (t, 500 + 400 * math.sin(t), 400))
+            stream.write("points " + " ".join(values) + "\n")
+            stream.flush()
+            if not stream.readline():
+                raise ConnectionResetError("control socket closed")
+            delay = started + (n + 1) * batch * spacing - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        connection.close()
+
+    moves = []
+    move_dot = gui.move_dot
+    gui.move_dot = lambda x, y: (moves.append(x), move_dot(x, y))
+    gui.laser_visible = True
+    gui.update_laser()
+    gui.scheduler.stop()  # only the control socket drives the laser
+    thread = threading.Thread(target=client)
+    cpu = time.process_time()
+    started = time.perf_counter()
+    thread.start()
+    # a real event loop, so waiting for the client costs no CPU
+    loop = QtCore.QEventLoop()
+    check = QtCore.QTimer()
+    check.timeout.connect(lambda: thread.is_alive() or gui.control_queue or loop.quit())
+    check.start(5)
+    loop.exec_()
+    check.stop()
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu
+    del gui.move_dot
+    gui.laser_visible = False
+    gui.update_laser()
+
+    expect(not errors, "control: client failed: %s" % errors)
+    if errors or not latencies:
+        return {}
+    points = batches * batch
+    latencies.sort()
+    return {
+        "control_status_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "control_points_per_s": points / elapsed,
+        "control_frames_per_s": len(moves) / elapsed,
+        "control_cpu_per_1000_ms": cpu / points * 1000 * 1000,
+    }
+
+
+EFFECT_SETS = ("none", "glow", "pulse", "glow+pulse", "trail", "glow+pulse+trail")
+
+
+def bench_effects(app, frames=500):
+    """Atlas cost and per-frame pointer cost for each set of effects.
+
+    The pointer is painted in one call that copies unscaled fragments out of
+    the atlas, whatever the effects, so the per-frame cost has to stay close
+    to that of the bare pointer; only the blended area grows.
+    """
+    results = {}
+    cache = MouseFollow.atlas_cache
+    dot = MouseFollow.RedDot()
+    dot.set_scale_factor(1.7)
+    dot.show()
+    for name in EFFECT_SETS:
+        effects = MouseFollow.parse_effects(name)
+        label = name.replace("+", "_")
+        cache.flush()
+        cache.clear()
+        for path in glob.glob(os.path.join(cache.root(), "*.png")):
+            os.remove(path)
+        started = time.perf_counter()
+        atlas = cache.get("pointer.png", 1.7, effects)
+        results["effects_%s_render_ms" % label] = (time.perf_counter() - started) * 1000
+        results["effects_%s_atlas_kb" % label] = atlas.bytes / 1024
+        cache.flush()
+        cache.clear()
+        started = time.perf_counter()
+        cache.get("pointer.png", 1.7, effects)
+        results["effects_%s_load_ms" % label] = (time.perf_counter() - started) * 1000
+        dot.set_effects(effects)
+        pump(app, 0.02)
+
+        def frame_loop():
+            for i in range(frames):
+                dot.move(400 + i % 200 * 4, 300)
+                dot.animate()
+                dot.repaint()
+
+        frame_loop()  # warm up
+        per_frame = min(timed(frame_loop, 1) for _ in range(7)) / frames
+        results["effects_%s_frame_us" % label] = per_frame * 1e6
+        area = dot.width() * dot.height() * dot.devicePixelRatioF() ** 2
+        results["effects_%s_window_kpx" % label] = area / 1000
+    dot.hide()
+    bare = results["effects_none_frame_us"]
+    for name in EFFECT_SETS[1:]:
+        cost = results["effects_%s_frame_us" % name.replace("+", "_")]
+        expect(
+            cost <= 2 * bare + 35,
+            "effects: %s costs %.0f us per frame, the bare pointer %.0f us"
+            % (name, cost, bare),
+        )
+
+    # the largest atlas: every effect at the top of the size range on HiDPI
+    effects = MouseFollow.POINTER_EFFECTS
+    cache.clear()
+    started = time.perf_counter()
+    atlas = cache.get("pointer.png", 5.0, effects, 2.0)
+    results["effects_largest_render_ms"] = (time.perf_counter() - started) * 1000
+    results["effects_largest_atlas_mb"] = atlas.bytes / 2**20
+    expect(
+        atlas.bytes <= cache.max_bytes,
+        "effects: the largest atlas does not fit the cache on its own",
+    )
+    cache.flush()
+    cache.clear()
+    return results
+
+
+def run(skip_startup=False):
+    app = QtWidgets.QApplication(sys.argv)
+    results = {}
+    if not skip_startup:
+        results["startup"] = bench_startup()
+    gui = MouseFollow.Master()
+    pump(app, 0.1)
+
+    results["move_dot"] = bench_move_dot(app, gui)
+    results["scheduler"] = bench_scheduler(app, gui)
+    results["filters"] = bench_filters()
+    results["scale_factor"] = bench_scale_factor(app)
+    results["drawbox"] = bench_drawbox(app)
+    results["settings"] = bench_settings(gui)
+    results["regions"] = bench_regions(app, gui)
+    results["hotkeys"] = bench_hotkeys(app, gui)
+    results["ink"] = bench_ink(app)
+    results["session"] = bench_session(app, gui)
+    results["calibration"] = bench_calibration(app)
+    results["stream"] = bench_stream()
+    results["control"] = bench_control(app, gui)
+    results["effects"] = bench_effects(app)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QtCore.QT_VERSION_STR,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "failures": failures,
+    }
+
+
+def lower_is_better(metric):
+    return metric.endswith(("_ms", "_us", "_px"))
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for group, metrics in current["results"].items():
+        old_metrics = baseline["results"].get(group, {})
+        for metric, value in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None or not lower_is_better(metric):
+                continue
+            change = (value - old) / old if old else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(group + "." + metric)
+            print(
+                "%-45s %12.4f -> %12.4f  %+7.1f%%%s"
+                % (group + "." + metric, old, value, change * 100, flag)
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a stored JSON run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="relative slowdown counted as a regression (default 0.15)",
+    )
+    parser.add_argument(
+        "--skip-startup", action="store_true", help="skip the subprocess startup run"
+    )
+    args = parser.parse_args()
+
+    try:
+        current = run(args.skip_startup)
+    finally:
+        shutil.rmtree(BENCH_HOME, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    for failure in current["failures"]:
+        print("FAILED: " + failure)
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("regressed: " + ", ".join(regressions))
+            sys.exit(1)
+    elif not args.output:
+        print(json.dumps(current, indent=2))
+    if current["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()